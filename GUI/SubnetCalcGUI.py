@@ -32,6 +32,20 @@ ctrl_ascii_chars = [
 ]
 
 
+class _SavedControl(object):
+    """Just enough of a PersistentObject for PersistenceManager.RestoreValue() to find a control's saved value"""
+
+    def __init__(self, kind: str, name: str):
+        self._kind = kind
+        self._name = name
+
+    def GetKind(self):
+        return self._kind
+
+    def GetName(self):
+        return self._name
+
+
 class SubnetCalcFrame(BaseCalculatorFrame):
     def __init__(self, *args, **kwds):
         BaseCalculatorFrame.__init__(self, *args, **kwds)
@@ -44,7 +58,7 @@ class SubnetCalcFrame(BaseCalculatorFrame):
             self.label_network, self.label_slash, self.label_usable
         ]
 
-        self.settings_window = SettingsFrame(self, name='SettingsFrame')
+        self._settings_window = None  # built by the settings_window property when it is first opened
 
         self.text_controls = [self.text_ctrl_dotted, self.text_ctrl_mask]
 
@@ -97,13 +111,10 @@ class SubnetCalcFrame(BaseCalculatorFrame):
         # Restore any saved selections and window placement
         self.persistence_manager.RegisterAndRestore(self)
         self.persistence_manager.RegisterAndRestoreAll(
-            self, children=[
-                self.checkbox_stay_on_top, self.text_ctrl_dotted, self.spin_ctrl_mask,
-                self.settings_window.radio_box_theme
-            ]
+            self, children=[self.checkbox_stay_on_top, self.text_ctrl_dotted, self.spin_ctrl_mask]
         )
 
-        self.apply_theme(theme_name=self.settings_window.radio_box_theme.GetStringSelection())
+        self.apply_theme(theme_name=self.saved_theme_name())
 
         self.select_all_text(self.text_ctrl_dotted)
 
@@ -111,6 +122,14 @@ class SubnetCalcFrame(BaseCalculatorFrame):
 
         self.stay_on_top(enable=self.checkbox_stay_on_top.IsChecked())
 
+    @property
+    def settings_window(self):
+        """The SettingsFrame, built (and its saved selection restored) the first time it is needed"""
+        if self._settings_window is None:
+            self._settings_window = SettingsFrame(self, name='SettingsFrame')
+            self.persistence_manager.RegisterAndRestore(self._settings_window.radio_box_theme)
+        return self._settings_window
+
     def apply_theme(self, theme_name: str):
         theme = self.themes.get(theme_name, None)
         if not theme:
@@ -257,12 +276,33 @@ class SubnetCalcFrame(BaseCalculatorFrame):
 
     def reset_results(self):
         for text_control in self.text_controls_readonly:
-            text_control.ChangeValue('')
+            self.update_text(text_control, '')
+
+    def saved_theme_name(self) -> str:
+        """Read the theme saved for the settings window's radio box without having to build the settings window"""
+        selection = self.persistence_manager.RestoreValue(
+            _SavedControl(pm.PERSIST_RADIOBOX_KIND, 'radio_box_theme'), pm.PERSIST_RADIOBOX_SELECTION
+        )
+        if selection is None or not (0 <= selection < len(SettingsFrame.theme_names)):
+            return SettingsFrame.theme_names[SettingsFrame.default_theme]
+        return SettingsFrame.theme_names[selection]
 
     def select_all_text(self, text_control):
         wx.CallAfter(text_control.SetInsertionPointEnd)
         wx.CallAfter(text_control.SelectAll)
 
+    @staticmethod
+    def update_control(control, value):
+        """SetValue() for a slider or spin control, skipped when it already has the value"""
+        if control.GetValue() != value:
+            control.SetValue(value)
+
+    @staticmethod
+    def update_text(text_control, value: str):
+        """ChangeValue() (no EVT_TEXT) for a TextCtrl, skipped when it already has the value"""
+        if text_control.GetValue() != value:
+            text_control.ChangeValue(value)
+
     def stay_on_top(self, enable: bool = True):
         if enable:
             # Binary OR wx.STAY_ON_TOP to add it if it's not already present
@@ -273,6 +313,10 @@ class SubnetCalcFrame(BaseCalculatorFrame):
 
 
 class SettingsFrame(BaseSettingsFrame):
+    # choices of radio_box_theme in the order BaseSettingsFrame creates them, and the one it selects by default
+    theme_names = ['dark', 'light']
+    default_theme = 1
+
     def __init__(self, *args, **kwds):
         kwds["style"] = kwds.get("style", 0)
         BaseSettingsFrame.__init__(self, *args, **kwds)
@@ -288,7 +332,7 @@ class SettingsFrame(BaseSettingsFrame):
             "See the files COPYING and COPYING.LESSER distributed with this program\n" \
             "or https://www.gnu.org/licenses/ if you did not receive them with your copy."
         info = wx.adv.AboutDialogInfo()
-        info.SetIcon(SubnetCalcPNG.GetIcon())
+        info.SetIcon(get_icon('SubnetCalcPNG'))
         info.SetName('Quick Subnet Calculator')
         info.SetVersion('1.1')
         info.SetDescription(program_description)
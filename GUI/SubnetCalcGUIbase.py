@@ -42,8 +42,8 @@ class BaseCalculatorFrame(wx.Frame):
         # Fix issue on Windows where widgets and text flicker when the mouse passes over them
         self.panel_main.SetDoubleBuffered(True)
         self.checkbox_stay_on_top = wx.CheckBox(self.panel_main, wx.ID_ANY, "stay on top")
-        self.bitmap_button_settings = wx.BitmapButton(self.panel_main, wx.ID_ANY, SettingsIcon.GetBitmap(), style=wx.BORDER_NONE | wx.BU_AUTODRAW | wx.BU_EXACTFIT | wx.BU_NOTEXT)
-        self.bitmap_button_exit = wx.BitmapButton(self.panel_main, wx.ID_ANY, ExitIcon.GetBitmap(), style=wx.BORDER_NONE | wx.BU_AUTODRAW | wx.BU_EXACTFIT | wx.BU_NOTEXT)
+        self.bitmap_button_settings = wx.BitmapButton(self.panel_main, wx.ID_ANY, get_bitmap('SettingsIcon'), style=wx.BORDER_NONE | wx.BU_AUTODRAW | wx.BU_EXACTFIT | wx.BU_NOTEXT)
+        self.bitmap_button_exit = wx.BitmapButton(self.panel_main, wx.ID_ANY, get_bitmap('ExitIcon'), style=wx.BORDER_NONE | wx.BU_AUTODRAW | wx.BU_EXACTFIT | wx.BU_NOTEXT)
         self.label_dotted = wx.StaticText(self.panel_main, wx.ID_ANY, "IP address:")
         self.text_ctrl_dotted = wx.TextCtrl(self.panel_main, wx.ID_ANY, "192.168.1.1")
         self.label_slash = wx.StaticText(self.panel_main, wx.ID_ANY, "/")
@@ -79,7 +79,7 @@ class BaseCalculatorFrame(wx.Frame):
         # begin wxGlade: BaseCalculatorFrame.__set_properties
         self.SetTitle("Quick Subnet Calculator")
         _icon = wx.NullIcon
-        _icon.CopyFromBitmap(SubnetCalcIcon.GetBitmap())
+        _icon.CopyFromBitmap(get_bitmap('SubnetCalcIcon'))
         self.SetIcon(_icon)
         self.checkbox_stay_on_top.SetValue(1)
         self.bitmap_button_settings.SetBackgroundColour(wx.Colour(238, 238, 238))
@@ -552,3 +552,31 @@ SubnetCalcPNGLarge = PyEmbeddedImage(
     b'OPzPg0g7E5a6zm4AbgauHI6rhv95A+kLfCpcqYUpSSXYkvSZ2v1IzcCi4VgI7Ez8k/Drgd+R'
     b'HtS7ueOf1wNXAw9GJabm2QBIUozZwG7ArsB2wHzSRjgLOv7ztsBcYE5HzO74z5AeuhuJ1R3/'
     b'eQVwD+n1xqXAso7/vBS4lfS2w+pGj1LZ+v9ClFgosSTFfwAAAABJRU5ErkJggg==')
+
+
+# PyEmbeddedImage only holds the base64 data, GetBitmap() and GetIcon() decode it again on every call.
+# The functions below decode each image on first use and keep the result, so nothing is decoded at import time
+# and images that are never shown (such as the About box icon) are never decoded at all.
+images = {
+    'ExitIcon': ExitIcon, 'SettingsIcon': SettingsIcon, 'SubnetCalcIcon': SubnetCalcIcon,
+    'SubnetCalcPNG': SubnetCalcPNG, 'SubnetCalcPNGLarge': SubnetCalcPNGLarge
+}
+
+_bitmaps = {}
+_icons = {}
+
+
+def get_bitmap(name: str):
+    """Return the wx.Bitmap for one of the images, decoding it on first use"""
+    bitmap = _bitmaps.get(name)
+    if bitmap is None:
+        bitmap = _bitmaps[name] = images[name].GetBitmap()
+    return bitmap
+
+
+def get_icon(name: str):
+    """Return the wx.Icon for one of the images, decoding it on first use"""
+    icon = _icons.get(name)
+    if icon is None:
+        icon = _icons[name] = images[name].GetIcon()
+    return icon
@@ -19,13 +19,38 @@
 # If not, see <https://www.gnu.org/licenses/>.
 
 
+import sys
+
+if __name__ == "__main__" and len(sys.argv) > 1:
+    # Arguments select the headless mode, which must not need wx
+    import multiprocessing
+    from libIPconv.enrich import main as enrich_main
+    multiprocessing.freeze_support()
+    sys.exit(enrich_main())
+
 import GUI
 import libIPconv as conv
 import wx
 
 
+# seconds without further input before a calculation runs, so a slider drag or key repeat only calculates once
+UPDATE_DELAY = 0.01
+
+
+def calculate(value: str):
+    """Runs on the calculation worker thread, which is the only user of main_calculator"""
+    if main_calculator.set_value(value):
+        return main_calculator.subnet_info()
+    return None
+
+
 class MainFrame(GUI.SubnetCalcFrame):
     def __init__(self, *args, **kwds):
+        # the base __init__ restores persisted control values, which sends EVT_TEXT and so calls update()
+        self._mask_object = None  # control the mask of the latest request came from
+        self.calculation_worker = conv.worker.LatestRequestWorker(
+            calculate, self.on_calculated, delay=UPDATE_DELAY, name='CalculationWorker'
+        )
         GUI.SubnetCalcFrame.__init__(self, *args, **kwds)
 
         self.text_ctrl_dotted.addr_type = conv.ADDRTYPE.DOTTED
@@ -35,10 +60,31 @@ class MainFrame(GUI.SubnetCalcFrame):
         self.text_ctrl_mask.mask_type = conv.MASKTYPE.DOTTED
         self.text_ctrl_mask.is_mask = True
 
-        main_calculator.set_value(f'{self.text_ctrl_dotted.GetValue()}/{self.spin_ctrl_mask.GetValue()}')
-        self.text_ctrl_mask.SetValue(conv.cidrToDottedQuadStr(self.slider_mask.GetValue()))
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
+
+        self.text_ctrl_mask.ChangeValue(conv.cidrToDottedQuadStr(self.slider_mask.GetValue()))
         self.update()
 
+    def apply_result(self, request_id: int, new_info):
+        """Show a calculation result on the UI thread, unless newer input has made it stale"""
+        if not self or not self.calculation_worker.is_latest(request_id):
+            return  # frame destroyed, or a newer request is on its way
+
+        if new_info is None:
+            self.reset_results()
+            return
+
+        self.update_text(self.text_ctrl_network, new_info['network_addr'])
+        self.update_text(self.text_ctrl_broadcast, new_info['broadcast_addr'])
+        self.update_text(self.text_ctrl_first_addr, new_info['first_addr'])
+        self.update_text(self.text_ctrl_last_addr, new_info['last_addr'])
+        self.update_text(self.text_ctrl_usable, new_info['usable'])
+        if self._mask_object is self.text_ctrl_mask:
+            self.update_control(self.slider_mask, int(new_info['prefix']))
+            self.update_control(self.spin_ctrl_mask, int(new_info['prefix']))
+        else:
+            self.update_text(self.text_ctrl_mask, new_info['netmask'])
+
     def on_char(self, event):
         super().on_char(event)
 
@@ -66,6 +112,15 @@ class MainFrame(GUI.SubnetCalcFrame):
             else:
                 event.Skip()
 
+    def on_calculated(self, request_id: int, new_info):
+        """Called on the calculation worker thread"""
+        wx.CallAfter(self.apply_result, request_id, new_info)
+
+    def on_destroy(self, event):
+        if event.GetEventObject() is self:
+            self.calculation_worker.stop()
+        event.Skip()
+
     def on_paste(self, event):
         success, pasted_string = super().on_paste(event)
 
@@ -104,20 +159,10 @@ class MainFrame(GUI.SubnetCalcFrame):
         else:
             mask_object = self.spin_ctrl_mask
 
-        if main_calculator.set_value(f'{self.text_ctrl_dotted.GetValue()}/{mask_object.GetValue()}'):
-            new_info = main_calculator.subnet_info()
-            self.text_ctrl_network.SetValue(new_info['network_addr'])
-            self.text_ctrl_broadcast.SetValue(new_info['broadcast_addr'])
-            self.text_ctrl_first_addr.SetValue(new_info['first_addr'])
-            self.text_ctrl_last_addr.SetValue(new_info['last_addr'])
-            self.text_ctrl_usable.SetValue(new_info['usable'])
-            if mask_object is self.text_ctrl_mask:
-                self.slider_mask.SetValue(int(new_info['prefix']))
-                self.spin_ctrl_mask.SetValue(int(new_info['prefix']))
-            else:
-                self.text_ctrl_mask.SetValue(new_info['netmask'])
-        else:
-            self.reset_results()
+        self._mask_object = mask_object
+        # Controls are only read here on the UI thread, the calculation and any superseded requests are left to
+        # the worker and the result comes back through on_calculated() and apply_result()
+        self.calculation_worker.submit(f'{self.text_ctrl_dotted.GetValue()}/{mask_object.GetValue()}')
 
 
 class MainApp(wx.App):
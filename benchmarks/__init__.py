@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Benchmarks for libIPconv. Run modules from the repository root, e.g. python -m benchmarks.subnet_engine"""
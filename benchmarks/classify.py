@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Compare classify.classify_address()/classify_batch() against the ipaddress is_* properties they replace"""
+
+import ipaddress
+import random
+import timeit
+
+from libIPconv.classify import classify_address, classify_batch
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def main(count: int = 100000, repeat: int = 3):
+    rng = random.Random(20)
+    values = [rng.getrandbits(32) for _ in range(count)]
+    addresses = [ipaddress.IPv4Address(value) for value in values]
+    batch = numpy.array(values, dtype=numpy.uint32) if numpy is not None else values
+
+    def ipaddress_properties():
+        for address in addresses:
+            (address.is_private, address.is_loopback, address.is_multicast, address.is_link_local,
+             address.is_reserved, address.is_unspecified)
+
+    cases = (
+        ('ipaddress is_*', ipaddress_properties),
+        ('classify_address', lambda: [classify_address(value) for value in values]),
+        ('classify_batch', lambda: classify_batch(batch)),
+    )
+    print(f'{count} IPv4 addresses (ipaddress objects built beforehand)')
+    for name, function in cases:
+        elapsed = min(timeit.repeat(function, number=1, repeat=repeat))
+        print(f'  {name:<17} {elapsed:.4f}s ({count / elapsed:,.0f} ops/s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Compare cidr.collapse_prefixes() against ipaddress.collapse_addresses()"""
+
+import ipaddress
+import random
+import timeit
+
+from libIPconv.cidr import collapse_prefixes
+
+
+def make_prefixes(count: int, seed: int = 8) -> tuple:
+    """Mostly /24-/32 blocks, half of them packed into a few /16s so that plenty of them touch or overlap"""
+    rng = random.Random(seed)
+    bases = [rng.getrandbits(16) << 16 for _ in range(8)]
+    networks = [(rng.choice(bases) | rng.getrandbits(16)) if rng.random() < 0.5 else rng.getrandbits(32)
+                for _ in range(count)]
+    prefixes = [rng.choice((24, 25, 26, 27, 28, 29, 30, 31, 32, 32, 32, 22)) for _ in range(count)]
+    return networks, prefixes
+
+
+def main(count: int = 200000, repeat: int = 3):
+    networks, prefixes = make_prefixes(count)
+    objects = [ipaddress.IPv4Network((network, prefix), strict=False) for network, prefix in zip(networks, prefixes)]
+
+    baseline_result = [(int(net.network_address), net.prefixlen) for net in ipaddress.collapse_addresses(objects)]
+    if collapse_prefixes(networks, prefixes) != baseline_result:
+        raise AssertionError('collapse_prefixes() result differs from ipaddress.collapse_addresses()')
+
+    inputs = {'lists': (networks, prefixes)}
+    try:
+        import numpy
+    except ImportError:
+        pass
+    else:
+        inputs['numpy'] = (numpy.array(networks, dtype=numpy.uint32), numpy.array(prefixes, dtype=numpy.uint8))
+
+    print(f'{count} prefixes collapsed to {len(baseline_result)}')
+    baseline = min(timeit.repeat(lambda: list(ipaddress.collapse_addresses(objects)), number=1, repeat=repeat))
+    print(f'  ipaddress.collapse_addresses (objects prebuilt) {baseline:.3f}s')
+    for name, (network_values, prefix_values) in inputs.items():
+        elapsed = min(timeit.repeat(lambda: collapse_prefixes(network_values, prefix_values), number=1, repeat=repeat))
+        print(f'  collapse_prefixes ({name}){"":<22} {elapsed:.3f}s ({baseline / elapsed:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Compare the per-address dotted-quad conversions against their bulk counterparts"""
+
+import random
+import timeit
+
+from libIPconv.conversions import (
+    decArrayToDottedQuadStrList, decToDottedQuadStr, dottedQuadStrListToDecArray, dottedQuadStrToDecStr
+)
+
+
+def main(count: int = 1000000, repeat: int = 3):
+    rng = random.Random(3)
+    int_values = [rng.getrandbits(32) for _ in range(count)]
+    str_values = decArrayToDottedQuadStrList(int_values)
+    buffer = '\n'.join(str_values).encode('ascii')
+
+    timings = {
+        'dottedQuadStrToDecStr (per address)': lambda: [dottedQuadStrToDecStr(value) for value in str_values],
+        'dottedQuadStrListToDecArray (list)': lambda: dottedQuadStrListToDecArray(str_values),
+        'dottedQuadStrListToDecArray (bytes)': lambda: dottedQuadStrListToDecArray(buffer),
+        'decToDottedQuadStr (per address)': lambda: [decToDottedQuadStr(value) for value in int_values],
+        'decArrayToDottedQuadStrList': lambda: decArrayToDottedQuadStrList(int_values),
+    }
+    print(f'{count} addresses')
+    for name, function in timings.items():
+        elapsed = min(timeit.repeat(function, number=1, repeat=repeat))
+        print(f'  {name:<40} {elapsed:.3f}s ({count / elapsed:,.0f} ops/s)')
+
+
+if __name__ == '__main__':
+    main()
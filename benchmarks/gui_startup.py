@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Time from the start of a fresh process to the first paint of the main window, for the current tree and for the tree
+before image decoding and the settings window became lazy (BEFORE_REV, exported with git archive), so the difference
+is the real before/after of that change. Each run uses a new, empty home directory, so no saved settings are restored.
+Needs git, wxPython and a display.
+
+    python -m benchmarks.gui_startup [--runs N] [--before REV]
+"""
+
+import argparse
+import io
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+_start = time.perf_counter()
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# parent of the commit that decoded the embedded images on first use and built the settings window lazily
+BEFORE_REV = 'a160293^'
+
+
+def measure() -> float:
+    """Open the main window in this process and return the seconds until its panel is first painted"""
+    import wx
+    import libIPconv as conv
+    import Quick_Subnet_Calculator
+
+    Quick_Subnet_Calculator.main_calculator = conv.SubnetCalculator()
+    painted = []
+
+    def on_paint(event):
+        if not painted:
+            painted.append(time.perf_counter() - _start)
+            wx.CallAfter(frame.Destroy)
+        event.Skip()
+
+    app = wx.App(False)
+    frame = Quick_Subnet_Calculator.MainFrame(None, wx.ID_ANY, "", name='MainFrame')
+    frame.panel_main.Bind(wx.EVT_PAINT, on_paint)
+    frame.Show()
+    app.MainLoop()
+    return painted[0]
+
+
+def export_tree(revision: str, directory: str):
+    """Write the files of revision to directory"""
+    archive = subprocess.run(
+        ['git', '-C', REPO_ROOT, 'archive', '--format=tar', revision], check=True, stdout=subprocess.PIPE
+    ).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar_file:
+        tar_file.extractall(directory)
+
+
+def time_tree(tree: str, runs: int) -> list:
+    """Seconds to first paint of runs fresh processes importing the GUI from tree"""
+    results = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as home:
+            # persisted settings would be restored at startup, so each run starts from nothing
+            environment = dict(os.environ, HOME=home, APPDATA=home, XDG_CONFIG_HOME=home)
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.gui_startup', '--child', tree], cwd=REPO_ROOT, env=environment,
+                check=True, stdout=subprocess.PIPE, universal_newlines=True
+            ).stdout
+        results.append(float(output.split()[-1]))
+    return results
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10, help='fresh processes per tree (default: %(default)s)')
+    parser.add_argument('--before', default=BEFORE_REV, help='git revision to compare with (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as before_tree:
+        export_tree(args.before, before_tree)
+        for name, tree in (('current tree', REPO_ROOT), (f'before ({args.before})', before_tree)):
+            results = time_tree(tree, args.runs)
+            print(f'{name:<22} median {statistics.median(results) * 1000:.1f}ms, best {min(results) * 1000:.1f}ms')
+
+
+if __name__ == '__main__':
+    if '--child' in sys.argv:
+        sys.path.insert(0, sys.argv[sys.argv.index('--child') + 1])  # import the GUI from that tree
+        print(measure())
+    else:
+        main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Import-time regression gate, using 'python -X importtime' in fresh processes.
+Fails (exit status 1) if a statement imports one of the heavy modules it should leave alone, or if its median
+cumulative import time goes over the budget (in milliseconds, scale with --budget-scale on slow machines).
+"""
+
+import argparse
+import compileall
+import os
+import statistics
+import subprocess
+import sys
+
+# statement, budget in ms, modules that must not be imported by it
+CASES = (
+    ('import libIPconv', 5.0, ('numpy', 'ipaddress', 'libIPconv.converter', 'libIPconv.subnetcalculator')),
+    ('from libIPconv import isValidIPv4', 25.0, ('numpy', 'ipaddress', 'libIPconv.subnetcalculator')),
+    ('from libIPconv import cidrToDottedQuadStr', 25.0, ('numpy', 'ipaddress', 'libIPconv.subnetcalculator')),
+    ('from libIPconv import SubnetCalculator', 40.0, ('numpy', 'concurrent.futures')),
+)
+
+
+# prints the forbidden modules that were imported
+_CHECK = "import sys; print(' '.join(name for name in {forbidden!r} if name in sys.modules))"
+
+
+def import_time(statement: str, forbidden: tuple = ()) -> tuple:
+    """
+    Run statement in a new interpreter
+    :return: tuple of (dict of top-level module name to cumulative microseconds, list of forbidden modules imported)
+    """
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'{statement}\n' + _CHECK.format(forbidden=forbidden)],
+        check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        # 'import time: self [us] | cumulative | imported package', top-level imports are not indented
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, name = line.split('|')
+            if cumulative.strip().isdigit() and not name.startswith('  '):
+                times[name.strip()] = int(cumulative)
+    return times, process.stdout.split()
+
+
+def statement_time(statement: str, forbidden: tuple, startup_modules: set) -> tuple:
+    """Like import_time(), but the total microseconds of the imports the statement made itself"""
+    times, imported = import_time(statement, forbidden)
+    return sum(time for name, time in times.items() if name not in startup_modules), imported
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=9, help='fresh interpreters per statement')
+    parser.add_argument('--budget-scale', type=float, default=1.0, help='multiply every budget by this')
+    args = parser.parse_args(argv)
+
+    # measure imports, not compiling: bytecode may be stale or never written (PYTHONDONTWRITEBYTECODE)
+    compileall.compile_dir(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'libIPconv'),
+                           quiet=1)
+    startup_modules = set(import_time('pass')[0])  # imported by the interpreter before the statement runs
+    failed = False
+    for statement, budget, forbidden in CASES:
+        results = [statement_time(statement, forbidden, startup_modules) for _ in range(args.runs)]
+        median = statistics.median(total for total, _ in results) / 1000
+        imported = results[-1][1]
+        budget *= args.budget_scale
+        ok = (median <= budget) and not imported
+        failed = failed or not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {statement:<45} {median:7.1f}ms (budget {budget:.1f}ms)"
+              + (f' imported {", ".join(imported)}' if imported else ''))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Compare isValidIPv4() against the regex implementation it replaced, on valid, invalid and adversarial input"""
+
+import random
+import timeit
+
+from libIPconv.convregex import DOTTEDQUADIP_STRICTREC, IP_RECLIST
+from libIPconv.globals import ADDRTYPE, V4_MAX_VALUE
+from libIPconv.validation import isValidIPv4
+
+
+def regex_is_valid_ipv4(input_value: str, addr_type: int = ADDRTYPE.NONE, strict: bool = False) -> bool:
+    """The regex-based isValidIPv4() str handling, kept here as the baseline"""
+    check_value = -1
+    if '.' in input_value and (addr_type in [ADDRTYPE.NONE, ADDRTYPE.DOTTED]):
+        if len(input_value) <= 15 and IP_RECLIST[ADDRTYPE.DOTTED].fullmatch(input_value):
+            if strict and not DOTTEDQUADIP_STRICTREC.fullmatch(input_value):
+                check_value = -2
+            else:
+                check_value = 0
+        else:
+            check_value = -3
+    elif IP_RECLIST[ADDRTYPE.DEC].fullmatch(input_value) and (addr_type in [ADDRTYPE.NONE, ADDRTYPE.DEC]):
+        check_value = int(input_value)
+    elif IP_RECLIST[ADDRTYPE.HEX].fullmatch(input_value) and (addr_type in [ADDRTYPE.NONE, ADDRTYPE.HEX]):
+        check_value = int(input_value, 16)
+    return (check_value >= 0) and (check_value <= V4_MAX_VALUE)
+
+
+def make_inputs(count: int, seed: int = 5) -> dict:
+    rng = random.Random(seed)
+    valid = []
+    for _ in range(count):
+        value = rng.getrandbits(32)
+        valid.append(rng.choice([
+            f'{value >> 24}.{(value >> 16) & 255}.{(value >> 8) & 255}.{value & 255}', str(value), f'{value:x}',
+            f'0x{value:08X}', f'{value >> 24}.{(value >> 16) & 255}.'[:-1]
+        ]))
+    alphabet = '0123456789abcdefxX.-+ _\n١'
+    invalid = [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 18))) for _ in range(count)]
+    adversarial = [
+        rng.choice(['1' * 400, '1.' * 200 + '1', '0x' + 'f' * 300, '255.255.255.2555', '9' * 11, '.' * 16])
+        for _ in range(count)
+    ]
+    return {'valid': valid, 'invalid': invalid, 'adversarial': adversarial}
+
+
+def check_equivalence(inputs: dict):
+    for values in inputs.values():
+        for value in values:
+            for addr_type in ADDRTYPE:
+                for strict in (False, True):
+                    if isValidIPv4(value, addr_type, strict) != regex_is_valid_ipv4(value, addr_type, strict):
+                        raise AssertionError(f'results differ for {value!r} {addr_type!r} strict={strict}')
+
+
+def main(count: int = 100000, repeat: int = 3):
+    inputs = make_inputs(count)
+    check_equivalence(make_inputs(5000, seed=6))
+    for name, values in inputs.items():
+        print(f'{count} {name} inputs')
+        for label, function in (('regex', regex_is_valid_ipv4), ('scanner', isValidIPv4)):
+            elapsed = min(timeit.repeat(lambda: [function(value) for value in values], number=1, repeat=repeat))
+            print(f'  {label:<8} {elapsed:.3f}s ({count / elapsed:,.0f} ops/s)')
+
+
+if __name__ == '__main__':
+    main()
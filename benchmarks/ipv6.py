@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Compare the IPv6 str formatter/parser in conversions against round trips through ipaddress objects"""
+
+import ipaddress
+import random
+import timeit
+
+from libIPconv.conversions import decToV6Str, hiLoToV6StrList, v6StrListToHiLo, v6StrToDec
+
+
+def main(count: int = 100000, repeat: int = 3):
+    rng = random.Random(6)
+    # mix of dense, sparse (compressible) and small values like the ones people actually type
+    masks = (2 ** 128 - 1, 0xffffffff0000000000000000ffffffff, 0xffff)
+    values = [rng.getrandbits(128) & rng.choice(masks) for _ in range(count)]
+    strs = [decToV6Str(value) for value in values]
+    high_values, low_values = v6StrListToHiLo(strs)
+
+    cases = (
+        ('format', 'ipaddress', lambda: [str(ipaddress.IPv6Address(value)) for value in values]),
+        ('format', 'decToV6Str', lambda: [decToV6Str(value) for value in values]),
+        ('format', 'hiLoToV6StrList', lambda: hiLoToV6StrList(high_values, low_values)),
+        ('parse', 'ipaddress', lambda: [int(ipaddress.IPv6Address(value)) for value in strs]),
+        ('parse', 'v6StrToDec', lambda: [v6StrToDec(value) for value in strs]),
+        ('parse', 'v6StrListToHiLo', lambda: v6StrListToHiLo(strs)),
+    )
+    print(f'{count} IPv6 addresses')
+    for operation, name, function in cases:
+        elapsed = min(timeit.repeat(function, number=1, repeat=repeat))
+        print(f'  {operation:<7} {name:<16} {elapsed:.4f}s ({count / elapsed:,.0f} ops/s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Compare table lookups for masks against the computed conversions and list scans they replace"""
+
+import timeit
+
+from libIPconv.conversions import _convertMaskStr, _convertV6MaskStr, _mask_str_index, convertMaskStrToType
+from libIPconv.globals import MASKTYPE, V4_CIDR_MASK_BITCOUNTS, V4_CIDR_MASKS
+
+
+def main(rounds: int = 200, repeat: int = 3):
+    convertMaskStrToType('24', MASKTYPE.CIDR, MASKTYPE.DOTTED)  # fills _mask_str_index
+    conversions = [
+        (input_value, input_type, output_type, version)
+        for (version, input_type, input_value), outputs in _mask_str_index.items() for output_type in outputs
+    ]
+    count = rounds * len(conversions)
+    computed_functions = {4: _convertMaskStr, 6: _convertV6MaskStr}
+
+    def computed():
+        for input_value, input_type, output_type, version in conversions:
+            computed_functions[version](input_value, input_type, output_type)
+
+    def indexed():
+        for input_value, input_type, output_type, version in conversions:
+            convertMaskStrToType(input_value, input_type, output_type, version=version)
+
+    masks = list(V4_CIDR_MASKS) * 3 + [1, 2, 3]
+
+    def list_scan():
+        for mask in masks:
+            mask in V4_CIDR_MASKS
+
+    def dict_lookup():
+        for mask in masks:
+            mask in V4_CIDR_MASK_BITCOUNTS
+
+    print(f'{count} convertMaskStrToType calls over every MASKTYPE pair')
+    for name, function in (('computed', computed), ('indexed', indexed)):
+        elapsed = min(timeit.repeat(function, number=rounds, repeat=repeat))
+        print(f'  {name:<12} {elapsed:.4f}s ({count / elapsed:,.0f} ops/s)')
+
+    count = rounds * len(masks)
+    print(f'{count} mask validity checks')
+    for name, function in (('list scan', list_scan), ('dict lookup', dict_lookup)):
+        elapsed = min(timeit.repeat(function, number=rounds, repeat=repeat))
+        print(f'  {name:<12} {elapsed:.4f}s ({count / elapsed:,.0f} ops/s)')
+
+
+if __name__ == '__main__':
+    main()
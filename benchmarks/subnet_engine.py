@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Compare SubnetCalculator.set_value()/subnet_info() against the integer-only v4_subnet_info()"""
+
+import ipaddress
+import random
+import timeit
+
+from libIPconv.conversions import dottedQuadStrToDecStr
+from libIPconv.subnetcalculator import SubnetCalculator, _v4_str, v4_subnet_info, v4_subnet_info_batch
+
+
+def make_inputs(count: int, seed: int = 4) -> list:
+    rng = random.Random(seed)
+    return [(rng.getrandbits(32), rng.randint(0, 32)) for _ in range(count)]
+
+
+def run_ipaddress_path(inputs: list):
+    """What SubnetCalculator did before it used the integer engine: build and format ipaddress objects"""
+    for address, prefix in inputs:
+        network = ipaddress.IPv4Network((address, prefix), strict=False)
+        whole = network.num_addresses <= 2
+        {
+            'broadcast_addr': f'{network.broadcast_address}',
+            'first_addr': f'{network.network_address if whole else network.network_address + 1}',
+            'last_addr': f'{network.broadcast_address if whole else network.broadcast_address - 1}',
+            'netmask': f'{network.netmask}', 'network_addr': f'{network.network_address}',
+            'prefix': f'{network.prefixlen}',
+            'usable': f'{network.num_addresses if whole else network.num_addresses - 2}'
+        }
+
+
+def run_calculator_path(values: list):
+    calculator = SubnetCalculator()
+    for value in values:
+        calculator.set_value(value)
+        calculator.subnet_info()
+
+
+def run_integer_path(inputs: list):
+    for address, prefix in inputs:
+        v4_subnet_info(address, prefix)
+
+
+def run_batch_path(addresses, prefixes):
+    v4_subnet_info_batch(addresses, prefixes)
+
+
+def check_equivalence(inputs: list):
+    calculator = SubnetCalculator()
+    for address, prefix in inputs:
+        calculator.set_value((address, prefix))
+        if calculator.subnet_info() != v4_subnet_info(address, prefix):
+            raise AssertionError(f'results differ for {address}/{prefix}')
+
+
+def main(count: int = 100000, repeat: int = 3):
+    inputs = make_inputs(count)
+    check_equivalence(inputs[:1000])
+    # include a realistic str input in the check, as produced by the GUI
+    calculator = SubnetCalculator()
+    calculator.set_value('192.168.1.1/24')
+    assert calculator.subnet_info() == v4_subnet_info(int(dottedQuadStrToDecStr('192.168.1.1')), 24)
+
+    baseline = min(timeit.repeat(lambda: run_ipaddress_path(inputs), number=1, repeat=repeat))
+    integer = min(timeit.repeat(lambda: run_integer_path(inputs), number=1, repeat=repeat))
+    print(f'{count} address/prefix pairs')
+    print(f'  ipaddress path: {baseline:.3f}s ({count / baseline:,.0f} ops/s)')
+    print(f'  integer path:   {integer:.3f}s ({count / integer:,.0f} ops/s)')
+    print(f'  speedup:        {baseline / integer:.1f}x')
+
+    values = [f'{_v4_str(address)}/{prefix}' for address, prefix in inputs]
+    calculator = min(timeit.repeat(lambda: run_calculator_path(values), number=1, repeat=repeat))
+    print(f'  SubnetCalculator with str input: {calculator:.3f}s ({count / calculator:,.0f} ops/s)')
+
+    addresses = [address for address, _ in inputs]
+    prefixes = [prefix for _, prefix in inputs]
+    try:
+        import numpy
+    except ImportError:
+        pass
+    else:
+        addresses = numpy.array(addresses, dtype=numpy.uint32)
+        prefixes = numpy.array(prefixes, dtype=numpy.uint8)
+    batch = min(timeit.repeat(lambda: run_batch_path(addresses, prefixes), number=1, repeat=repeat))
+    print(f'  batch (integer columns only): {batch:.4f}s ({count / batch:,.0f} ops/s)')
+
+
+if __name__ == '__main__':
+    main()
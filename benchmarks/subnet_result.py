@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Compare memory per result and allocation rate of subnet_info() dicts against SubnetInfo objects"""
+
+import gc
+import random
+import timeit
+import tracemalloc
+
+from libIPconv.subnetcalculator import SubnetInfo, v4_subnet_info
+
+
+def measure_memory(factory, inputs: list) -> float:
+    """Average bytes held per result while all results are alive"""
+    gc.collect()
+    tracemalloc.start()
+    results = [factory(address, prefix) for address, prefix in inputs]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return current / len(inputs)
+
+
+def main(count: int = 100000, repeat: int = 3):
+    rng = random.Random(18)
+    inputs = [(rng.getrandbits(32), rng.randint(0, 32)) for _ in range(count)]
+    factories = {'subnet_info dict': v4_subnet_info, 'SubnetInfo': SubnetInfo}
+
+    print(f'{count} results')
+    for name, factory in factories.items():
+        per_result = measure_memory(factory, inputs)
+        elapsed = min(timeit.repeat(lambda: [factory(*pair) for pair in inputs], number=1, repeat=repeat))
+        print(f'  {name:<18} {per_result:7.0f} bytes/result  {count / elapsed:12,.0f} results/s')
+
+    # reading a single field is the common case that lazy formatting is for
+    elapsed = min(timeit.repeat(lambda: [SubnetInfo(*pair).network_addr for pair in inputs], number=1, repeat=repeat))
+    print(f'  SubnetInfo + one str field: {count / elapsed:,.0f} results/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Benchmark suite for the libIPconv hot paths: one command runs every case at 1, 1K and 1M operations and reports
+ops/s and traced memory: the tracemalloc peak and retained bytes of one pass over up to MAX_TRACED_OPS operations
+(bytes, not allocation counts). Results can be saved as a JSON baseline and later runs compared to it.
+
+    python -m benchmarks.suite                      run everything and compare to benchmarks/baseline.json if present
+    python -m benchmarks.suite --save               run everything and (over)write the baseline
+    python -m benchmarks.suite --scales 1,1000 -k mask --threshold 0.1
+
+Exits with status 1 when a case's median ops/s is below the baseline median, or its traced memory is above the
+baseline, by more than the threshold. A case that looks slower is measured again before being reported.
+Baselines are only comparable on the same machine and Python version, which is recorded in the file.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from libIPconv import filters
+from libIPconv.conversions import convertAddrStrToType, convertMaskStrToType
+from libIPconv.converter import Converter
+from libIPconv.globals import ADDRTYPE, MASKTYPE, V4_CIDR_MASKS
+from libIPconv.subnetcalculator import SubnetCalculator
+from libIPconv.validation import isValidIPv4, isValidIPv4Mask
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_SCALES = (1, 1000, 1000000)
+DEFAULT_THRESHOLD = 0.15
+
+# distinct inputs generated per case, larger scales cycle through them
+POOL_SIZE = 10000
+# small scales are repeated until at least this many operations are timed per sample
+MIN_TIMED_OPS = 100000
+# timed samples per case, and per case at the largest scales where one sample takes seconds
+REPEAT = 7
+LARGE_REPEAT = 3
+# extra measurements of a case that looks slower than the baseline before it is reported
+CONFIRM_RUNS = 2
+# memory is traced over at most this many operations (tracemalloc is slow)
+MAX_TRACED_OPS = 10000
+# bytes of traced memory growth that are never reported as a regression
+ALLOCATION_SLACK = 1024
+
+
+# realistic input mixes, modelled on what the GUI and the headless mode pass in
+
+def _address_value(rng, addr_type: int) -> str:
+    value = rng.getrandbits(32)
+    if addr_type == ADDRTYPE.DEC:
+        return str(value)
+    elif addr_type == ADDRTYPE.HEX:
+        return f'{value:08x}' if rng.random() < 0.7 else f'0x{value:X}'
+    return f'{value >> 24}.{(value >> 16) & 255}.{(value >> 8) & 255}.{value & 255}'
+
+
+def _mask_value(rng, mask_type: int) -> str:
+    prefix = rng.choice((8, 16, 24, 24, 24, 25, 26, 27, 28, 29, 30, 32, rng.randint(0, 32)))
+    mask = V4_CIDR_MASKS[32 - prefix]
+    if mask_type == MASKTYPE.CIDR:
+        return str(prefix)
+    elif mask_type == MASKTYPE.DEC:
+        return str(mask)
+    elif mask_type == MASKTYPE.HEX:
+        return f'{mask:08x}'
+    return f'{mask >> 24}.{(mask >> 16) & 255}.{(mask >> 8) & 255}.{mask & 255}'
+
+
+def _invalid_value(rng) -> str:
+    return rng.choice(('', '256.1.1.1', '1.2.3.4.5', '1..2.3', 'abc', '99999999999', '0x1ffffffff', '10.0.0.-1'))
+
+
+def make_convert_addr(rng) -> tuple:
+    input_type, output_type = rng.choice([
+        (ADDRTYPE.DOTTED, ADDRTYPE.DEC), (ADDRTYPE.DOTTED, ADDRTYPE.HEX), (ADDRTYPE.DEC, ADDRTYPE.DOTTED),
+        (ADDRTYPE.DEC, ADDRTYPE.HEX), (ADDRTYPE.HEX, ADDRTYPE.DOTTED), (ADDRTYPE.HEX, ADDRTYPE.DEC)
+    ])
+    return _address_value(rng, input_type), input_type, output_type, rng.random() < 0.1
+
+
+def make_convert_mask(rng) -> tuple:
+    types = [MASKTYPE.CIDR, MASKTYPE.DEC, MASKTYPE.DOTTED, MASKTYPE.HEX]
+    input_type = rng.choice(types)
+    output_type = rng.choice([mask_type for mask_type in types if mask_type != input_type])
+    return _mask_value(rng, input_type), input_type, output_type
+
+
+def make_valid_ipv4(rng) -> tuple:
+    roll = rng.random()
+    if roll < 0.6:
+        return _address_value(rng, ADDRTYPE.DOTTED), ADDRTYPE.DOTTED
+    elif roll < 0.75:
+        # partial input while typing
+        return _address_value(rng, ADDRTYPE.DOTTED).rsplit('.', rng.randint(1, 3))[0], ADDRTYPE.DOTTED
+    elif roll < 0.85:
+        addr_type = rng.choice((ADDRTYPE.DEC, ADDRTYPE.HEX))
+        return _address_value(rng, addr_type), addr_type
+    elif roll < 0.9:
+        return rng.getrandbits(32), ADDRTYPE.NONE
+    return _invalid_value(rng), ADDRTYPE.NONE
+
+
+def make_valid_mask(rng) -> tuple:
+    if rng.random() < 0.85:
+        mask_type = rng.choice((MASKTYPE.DOTTED, MASKTYPE.DOTTED, MASKTYPE.CIDR, MASKTYPE.DEC, MASKTYPE.HEX))
+        return _mask_value(rng, mask_type), rng.choice((mask_type, MASKTYPE.NONE))
+    return rng.choice(('255.255.0.255', '255.0.255.0', '33', '255.255.255.1', _invalid_value(rng))), MASKTYPE.NONE
+
+
+def make_converter_value(rng) -> tuple:
+    addr_type = rng.choice((ADDRTYPE.DOTTED, ADDRTYPE.DOTTED, ADDRTYPE.DEC, ADDRTYPE.HEX))
+    return (_address_value(rng, addr_type) if rng.random() < 0.95 else _invalid_value(rng)), addr_type
+
+
+def make_subnet_value(rng) -> str:
+    roll = rng.random()
+    address = _address_value(rng, ADDRTYPE.DOTTED)
+    if roll < 0.7:
+        return f'{address}/{_mask_value(rng, MASKTYPE.CIDR)}'
+    elif roll < 0.95:
+        return f'{address}/{_mask_value(rng, MASKTYPE.DOTTED)}'
+    return f'{_invalid_value(rng)}/24'
+
+
+def make_pasted_chars(rng) -> tuple:
+    addr_type = rng.choice((ADDRTYPE.DOTTED, ADDRTYPE.DOTTED, ADDRTYPE.DEC, ADDRTYPE.HEX))
+    text = _address_value(rng, addr_type)
+    # pasted text often carries whitespace, a label or a port
+    text = rng.choice(('{}', ' {} ', 'ip: {}', '{}\n', '{}:8080', '\t{}')).format(text)
+    return text, addr_type
+
+
+# runners are called once per case and return the function that is timed, so any setup stays outside the timing
+
+def convert_addr_runner():
+    def run(inputs):
+        for value, input_type, output_type, reverse in inputs:
+            convertAddrStrToType(value, input_type, output_type, reverse=reverse, safe=True)
+    return run
+
+
+def convert_mask_runner():
+    def run(inputs):
+        for value, input_type, output_type in inputs:
+            convertMaskStrToType(value, input_type, output_type, safe=True)
+    return run
+
+
+def valid_ipv4_runner():
+    def run(inputs):
+        for value, addr_type in inputs:
+            isValidIPv4(value, addr_type)
+    return run
+
+
+def valid_mask_runner():
+    def run(inputs):
+        for value, mask_type in inputs:
+            isValidIPv4Mask(value, mask_type)
+    return run
+
+
+def converter_runner():
+    converter = Converter()
+    for addr_type in (ADDRTYPE.DEC, ADDRTYPE.DOTTED, ADDRTYPE.HEX):
+        converter.register_callback(len, addr_type)  # cheap stand-in for the GUI's SetValue()
+
+    def run(inputs):
+        for value, addr_type in inputs:
+            converter.set_value(value, addr_type)
+    return run
+
+
+def subnet_calculator_runner():
+    calculator = SubnetCalculator()
+
+    def run(inputs):
+        for value in inputs:
+            if calculator.set_value(value):
+                calculator.subnet_info()
+    return run
+
+
+def filter_chars_runner():
+    def run(inputs):
+        for text, addr_type in inputs:
+            filters.filterChars(text, addr_type)
+    return run
+
+
+# name: (input factory taking a random.Random, runner)
+CASES = {
+    'convertAddrStrToType': (make_convert_addr, convert_addr_runner),
+    'convertMaskStrToType': (make_convert_mask, convert_mask_runner),
+    'isValidIPv4': (make_valid_ipv4, valid_ipv4_runner),
+    'isValidIPv4Mask': (make_valid_mask, valid_mask_runner),
+    'Converter.set_value': (make_converter_value, converter_runner),
+    'SubnetCalculator.set_value+subnet_info': (make_subnet_value, subnet_calculator_runner),
+    'filters.filterChars': (make_pasted_chars, filter_chars_runner),
+}
+
+
+def make_inputs(factory, scale: int, seed: int = 24) -> list:
+    rng = random.Random(seed)
+    pool = [factory(rng) for _ in range(min(scale, POOL_SIZE))]
+    return (pool * (scale // len(pool) + 1))[:scale]
+
+
+def measure(run, inputs: list, repeat: int = None) -> dict:
+    """
+    Median ops/s and every sample's ops/s, plus the traced memory of one pass: the peak bytes allocated while
+    running and the bytes still allocated afterwards (caches, leaks)
+    """
+    if repeat is None:
+        repeat = REPEAT if len(inputs) < 1000000 else LARGE_REPEAT
+    rounds = max(1, MIN_TIMED_OPS // len(inputs))
+    run(inputs[:MAX_TRACED_OPS])  # warm up caches and lazy imports before timing
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            run(inputs)
+        samples.append(len(inputs) * rounds / (time.perf_counter() - start))
+
+    traced = inputs[:MAX_TRACED_OPS]
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        start_memory = tracemalloc.get_traced_memory()[0]
+        run(traced)
+        end_memory, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'ops_per_sec': statistics.median(samples), 'samples': samples, 'peak_bytes': peak_memory - start_memory,
+        'retained_bytes': end_memory - start_memory
+    }
+
+
+def environment() -> dict:
+    return {
+        'machine': platform.machine(), 'node': platform.node(), 'python': platform.python_version(),
+        'implementation': platform.python_implementation(), 'platform': platform.platform()
+    }
+
+
+def is_slower(result: dict, previous: dict, threshold: float) -> bool:
+    """Whether the median ops/s of result is more than threshold below the median of previous"""
+    previous_median = statistics.median(previous.get('samples', [previous['ops_per_sec']]))
+    return statistics.median(result['samples']) < previous_median * (1 - threshold)
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Return a list of messages for results worse than the baseline by more than threshold"""
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get('results', {}).get(key)
+        if previous is None:
+            continue
+        if is_slower(result, previous, threshold):
+            regressions.append(f"{key}: {result['ops_per_sec']:,.0f} ops/s vs {previous['ops_per_sec']:,.0f} baseline")
+        for memory_key in ('peak_bytes', 'retained_bytes'):
+            # allow for the odd freelist or interned str on top of the threshold
+            if result[memory_key] > previous[memory_key] * (1 + threshold) + ALLOCATION_SLACK:
+                regressions.append(f'{key}: {result[memory_key]:,} {memory_key} vs {previous[memory_key]:,} baseline')
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='JSON baseline file (default: %(default)s)')
+    parser.add_argument('--save', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--scales', default=','.join(map(str, DEFAULT_SCALES)),
+                        help='comma-separated operation counts (default: %(default)s)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed fractional slowdown/traced memory growth (default: %(default)s)')
+    parser.add_argument('-k', dest='keyword', default='', help='only run cases whose name contains this')
+    args = parser.parse_args(argv)
+
+    scales = [int(scale) for scale in args.scales.split(',')]
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get('environment') != environment():
+            print(f'warning: {args.baseline} was recorded in a different environment, comparisons may not hold')
+
+    results = {}
+    print(f"{'case':<40} {'scale':>8} {'ops/s':>12} {'peak mem B':>10} {'kept mem B':>10} {'vs baseline':>11}")
+    for name, (factory, runner) in CASES.items():
+        if args.keyword.lower() not in name.lower():
+            continue
+        for scale in scales:
+            key = f'{name}@{scale}'
+            # inputs are built per case (and again for a re-run), so no case's input is alive during another one
+            result = results[key] = measure(runner(), make_inputs(factory, scale))
+            previous = baseline.get('results', {}).get(key)
+            change = f"{result['ops_per_sec'] / previous['ops_per_sec'] - 1:+.1%}" if previous else ''
+            print(f"{name:<40} {scale:>8} {result['ops_per_sec']:>12,.0f} {result['peak_bytes']:>10,} "
+                  f"{result['retained_bytes']:>10,} {change:>11}")
+
+    if args.save:
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump({'environment': environment(), 'results': results}, baseline_file, indent=2, sort_keys=True)
+        print(f'saved baseline to {args.baseline}')
+        return 0
+
+    # the median over extra runs for anything that looks slower, before failing on what may just be a noisy moment
+    for key, result in results.items():
+        previous = baseline.get('results', {}).get(key)
+        for _ in range(CONFIRM_RUNS if previous else 0):
+            if not is_slower(result, previous, args.threshold):
+                break
+            name, scale = key.rsplit('@', 1)
+            factory, runner = CASES[name]
+            again = measure(runner(), make_inputs(factory, int(scale)))
+            result['samples'] += again['samples']
+            result['ops_per_sec'] = statistics.median(result['samples'])
+            print(f"{key:<49} re-run {result['ops_per_sec']:>12,.0f}")
+
+    regressions = compare(results, baseline, args.threshold)
+    for message in regressions:
+        print(f'REGRESSION {message}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
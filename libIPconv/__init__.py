@@ -19,13 +19,59 @@
 # If not, see <https://www.gnu.org/licenses/>.
 
 
-from . import augment
-from . import filters
-from .converter import *
-from .subnetcalculator import *
-from .validation import *
+import importlib
+import os
+
+
+# Submodules and the names re-exported from converter, subnetcalculator and validation are imported on first access
+# (PEP 562), so 'import libIPconv' stays cheap for short-lived scripts that only use part of the library.
+_submodules = {
+    'augment', 'bitmap', 'cache', 'cidr', 'classify', 'conversions', 'converter', 'convregex', 'extract', 'filters',
+    'globals', 'instrument', 'ipset', 'routetable', 'subnetcalculator', 'subnetdb', 'validation', 'worker'
+}
+
+# modules whose public names are available from the package, cheapest to import first
+_star_modules = ('converter', 'validation', 'subnetcalculator')
+
+# importing the globals submodule binds it over the globals() builtin in this namespace
+_namespace = globals()
+
+
+def __getattr__(name: str):
+    if name in _submodules:
+        return importlib.import_module(f'.{name}', __name__)
+    elif name == '__all__':
+        # 'from libIPconv import *' gets what it got before the lazy loading: augment, filters and the public names of
+        # the star modules. The other submodules (bitmap, ipset and the like) are left out so that it does not import
+        # them all, use 'from libIPconv import bitmap' or import from the submodule for those.
+        names = {'augment', 'filters'}
+        for module_name in _star_modules:
+            names.update(name for name in dir(importlib.import_module(f'.{module_name}', __name__)) if name[0] != '_')
+        return sorted(names)
+
+    if not name.startswith('_'):
+        for module_name in _star_modules:
+            module = importlib.import_module(f'.{module_name}', __name__)
+            if hasattr(module, name):
+                value = getattr(module, name)
+                _namespace[name] = value  # later lookups skip __getattr__
+                return value
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    names = set(_namespace) | _submodules
+    for module_name in _star_modules:
+        names.update(name for name in dir(importlib.import_module(f'.{module_name}', __name__)) if name[0] != '_')
+    return sorted(names)
 
 
 __version__ = '2.0'
 
+if os.environ.get('LIBIPCONV_INSTRUMENT', '') not in ('', '0'):
+    # see instrument.py, this imports the instrumented modules right away instead of on first use
+    from . import instrument
+    instrument.enable()
+
 """Note: This library is under construction and once it's in a stable form it will get a github repo to itself"""
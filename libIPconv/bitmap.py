@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""This module contains AddressBitmap, a compressed bitmap of IPv4 addresses in the style of roaring bitmaps"""
+
+import array
+import bisect
+import mmap
+import os
+import struct
+import sys
+import threading
+from .globals import V4_MAX_VALUE
+from .lazy import optional_import
+
+_numpy = optional_import('numpy')  # when None, batch functions fall back to loops over the scalar ones
+
+
+_ARRAY_LIMIT = 4096  # array containers holding more values than this are converted to bitmaps
+_BITMAP_BYTES = 8192  # one bit for each of the 65536 low 16-bit values
+
+# file layout: header, then one directory entry per container, then the container payloads
+_FILE_MAGIC = b'QSCBMP1\x00'
+_HEADER = struct.Struct('<8sII')  # magic, container count, reserved
+_DIRECTORY_ENTRY = struct.Struct('<HHIQ')  # key, is bitmap, cardinality, payload offset
+
+
+class _Container(object):
+    """
+    Addresses sharing the same high 16 bits: a sorted array('H') of low bits, or a bitmap once that gets large.
+    data can also be a read-only memoryview into a loaded file, which is copied on first modification.
+    """
+    __slots__ = ('bitmap', 'cardinality', 'data')
+
+    def __init__(self, data, cardinality: int, bitmap: bool):
+        self.bitmap = bitmap
+        self.cardinality = cardinality
+        self.data = data
+
+    def add(self, low: int) -> bool:
+        """Add a low 16-bit value and return True if it was not already present"""
+        self._make_writable()
+        if self.bitmap:
+            byte_index, bit = low >> 3, 1 << (low & 7)
+            if self.data[byte_index] & bit:
+                return False
+            self.data[byte_index] |= bit
+        else:
+            position = bisect.bisect_left(self.data, low)
+            if (position < len(self.data)) and (self.data[position] == low):
+                return False
+            self.data.insert(position, low)
+            if len(self.data) > _ARRAY_LIMIT:
+                self._to_bitmap()
+        self.cardinality += 1
+        return True
+
+    def contains(self, low: int) -> bool:
+        if self.bitmap:
+            return bool(self.data[low >> 3] & (1 << (low & 7)))
+        position = bisect.bisect_left(self.data, low)
+        return (position < len(self.data)) and (self.data[position] == low)
+
+    def count_range(self, first: int, last: int) -> int:
+        """Number of values from first to last inclusive"""
+        if (first == 0) and (last == 0xffff):
+            return self.cardinality
+        if self.bitmap:
+            bits = int.from_bytes(self.data[first >> 3:(last >> 3) + 1], 'little') >> (first & 7)
+            return _popcount(bits & ((1 << (last - first + 1)) - 1))
+        return bisect.bisect_right(self.data, last) - bisect.bisect_left(self.data, first)
+
+    def _make_writable(self):
+        if isinstance(self.data, memoryview):
+            self.data = bytearray(self.data) if self.bitmap else array.array('H', self.data)
+
+    def _to_bitmap(self):
+        bitmap = bytearray(_BITMAP_BYTES)
+        for low in self.data:
+            bitmap[low >> 3] |= 1 << (low & 7)
+        self.data = bitmap
+        self.bitmap = True
+
+
+class AddressBitmap(object):
+    """
+    Set of IPv4 addresses split into containers keyed by the high 16 bits of each address.
+    Sparse containers are sorted 16-bit arrays and dense ones are 8 KiB bitmaps, so the full IPv4 space
+    takes at most 512 MiB and typical sets take far less. Saved files can be loaded with mmap without copying.
+    """
+
+    def __init__(self):
+        self._containers = {}  # high 16 bits -> _Container
+        self._mapped = None  # mmap backing loaded containers, if any
+
+    def __contains__(self, address: int) -> bool:
+        container = self._containers.get(address >> 16)
+        return (container is not None) and container.contains(address & 0xffff)
+
+    def __len__(self):
+        return sum(container.cardinality for container in self._containers.values())
+
+    def add(self, address: int):
+        if (address < 0) or (address > V4_MAX_VALUE):
+            raise ValueError(f'Input value is outside of IPv4 range: {address}')
+        container = self._containers.get(address >> 16)
+        if container is None:
+            container = self._containers[address >> 16] = _Container(array.array('H'), 0, False)
+        container.add(address & 0xffff)
+
+    def add_batch(self, addresses):
+        """Add every address of a uint32 numpy array or sequence of int"""
+        numpy = _numpy()
+        if numpy is None:
+            for address in addresses:
+                self.add(address)
+            return
+
+        addresses = numpy.unique(numpy.asarray(addresses, dtype=numpy.uint32))
+        keys = addresses >> 16
+        lows = (addresses & 0xffff).astype(numpy.uint16)
+        # addresses are sorted, so each key is a contiguous run
+        bounds = numpy.flatnonzero(numpy.diff(keys)) + 1
+        for group_start, group_end in zip([0] + bounds.tolist(), bounds.tolist() + [addresses.size]):
+            key = int(keys[group_start])
+            group = lows[group_start:group_end]
+            container = self._containers.get(key)
+            if container is None:
+                container = self._containers[key] = _Container(array.array('H'), 0, False)
+            container._make_writable()
+            if not container.bitmap:
+                merged = numpy.union1d(numpy.frombuffer(container.data, dtype=numpy.uint16), group)
+                container.data = array.array('H', merged.tobytes())
+                container.cardinality = merged.size
+                if merged.size > _ARRAY_LIMIT:
+                    container._to_bitmap()
+            else:
+                bits = numpy.frombuffer(container.data, dtype=numpy.uint8)
+                numpy.bitwise_or.at(bits, group >> 3, (1 << (group & 7)).astype(numpy.uint8))
+                container.cardinality = int(numpy.unpackbits(bits).sum())
+
+    def contains_batch(self, addresses):
+        """Membership test for each address, as a numpy bool array with numpy installed or a list of bool"""
+        numpy = _numpy()
+        if numpy is None:
+            return [address in self for address in addresses]
+
+        addresses = numpy.asarray(addresses, dtype=numpy.uint32)
+        result = numpy.zeros(addresses.shape, dtype=bool)
+        if not addresses.size:
+            return result
+        flat_addresses = addresses.ravel()
+        flat_result = result.reshape(-1)
+        # sorted once, so each key is a contiguous run of order, as in add_batch()
+        keys = flat_addresses >> 16
+        order = numpy.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        bounds = numpy.flatnonzero(numpy.diff(sorted_keys)) + 1
+        array_keys = []
+        array_parts = []
+        for group_start, group_end in zip([0] + bounds.tolist(), bounds.tolist() + [sorted_keys.size]):
+            key = int(sorted_keys[group_start])
+            container = self._containers.get(key)
+            if container is None:
+                continue
+            if not container.bitmap:
+                array_keys.append(key)
+                array_parts.append(container.data)
+                continue
+            selected = order[group_start:group_end]
+            lows = (flat_addresses[selected] & 0xffff).astype(numpy.int64)
+            bits = numpy.frombuffer(container.data, dtype=numpy.uint8)
+            flat_result[selected] = (bits[lows >> 3] >> (lows & 7)) & 1
+
+        if array_parts:
+            # members of every array container touched, as full addresses in one sorted column for a single search
+            lengths = [len(part) for part in array_parts]
+            members = numpy.repeat(numpy.array(array_keys, dtype=numpy.uint32) << 16, lengths)
+            members |= numpy.frombuffer(b''.join(array_parts), dtype=numpy.uint16)
+            positions = numpy.minimum(numpy.searchsorted(members, flat_addresses), members.size - 1)
+            flat_result |= members[positions] == flat_addresses
+        return result
+
+    def count_range(self, first: int, last: int) -> int:
+        """Number of addresses in the set from first to last inclusive"""
+        total = 0
+        first_key, last_key = first >> 16, last >> 16
+        for key in sorted(key for key in self._containers if first_key <= key <= last_key):
+            total += self._containers[key].count_range(
+                (first & 0xffff) if key == first_key else 0, (last & 0xffff) if key == last_key else 0xffff
+            )
+        return total
+
+    def count_subnet(self, network: int, prefix: int, usable_only: bool = False) -> int:
+        """
+        Number of addresses in the set within a subnet. Host bits in network are ignored.
+        With usable_only, the network and broadcast addresses of subnets larger than /31 are not counted, which gives
+        a seen-address equivalent of the 'usable' value of subnet_info().
+        """
+        if (prefix < 0) or (prefix > 32):
+            raise ValueError(f'{prefix} is not a valid CIDR bit count')
+        host_mask = (1 << (32 - prefix)) - 1
+        first = network & (V4_MAX_VALUE ^ host_mask)
+        last = first | host_mask
+        if usable_only and prefix < 31:
+            first += 1
+            last -= 1
+        return self.count_range(first, last)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Memory-map a file written by save(). Containers are read-only views of the file until they are modified,
+        so loading is near-instant and processes loading the same file share the page cache.
+        """
+        loaded = cls()
+        with open(path, 'rb') as file_object:
+            loaded._mapped = mmap.mmap(file_object.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(loaded._mapped)
+        magic, count, _ = _HEADER.unpack_from(view, 0)
+        if magic != _FILE_MAGIC:
+            raise ValueError(f'{path} is not an AddressBitmap file')
+        for index in range(count):
+            key, is_bitmap, cardinality, offset = _DIRECTORY_ENTRY.unpack_from(
+                view, _HEADER.size + (index * _DIRECTORY_ENTRY.size)
+            )
+            if is_bitmap:
+                data = view[offset:offset + _BITMAP_BYTES]
+            elif sys.byteorder == 'little':
+                data = view[offset:offset + (cardinality * 2)].cast('H')
+            else:
+                data = array.array('H', view[offset:offset + (cardinality * 2)])
+                data.byteswap()
+            loaded._containers[key] = _Container(data, cardinality, bool(is_bitmap))
+        return loaded
+
+    def save(self, path):
+        """Write the bitmap to a file that load() can memory-map"""
+        keys = sorted(self._containers)
+        offset = _HEADER.size + (len(keys) * _DIRECTORY_ENTRY.size)
+        directory = []
+        payloads = []
+        for key in keys:
+            container = self._containers[key]
+            if container.bitmap:
+                payload = bytes(container.data)
+            else:
+                values = array.array('H', container.data)
+                if sys.byteorder != 'little':
+                    values.byteswap()
+                payload = values.tobytes()
+            directory.append(_DIRECTORY_ENTRY.pack(key, container.bitmap, container.cardinality, offset))
+            payloads.append(payload)
+            offset += len(payload)
+        # written beside the target and renamed over it, so a bitmap load() has memory-mapped never changes under it
+        temp_path = f'{os.fspath(path)}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(temp_path, 'wb') as file_object:
+                file_object.write(_HEADER.pack(_FILE_MAGIC, len(keys), 0))
+                file_object.writelines(directory)
+                file_object.writelines(payloads)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+if hasattr(int, 'bit_count'):  # Python 3.10+
+    _popcount = int.bit_count
+else:
+    def _popcount(value: int) -> int:
+        return bin(value).count('1')
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""This module contains integer-based CIDR prefix operations that avoid building ipaddress objects"""
+
+from .globals import V4_MAX_VALUE
+from .lazy import optional_import
+
+_numpy = optional_import('numpy')  # when None, collapse_prefixes() sorts and merges with plain Python instead
+
+
+def collapse_prefixes(networks, prefixes, version: int = 4) -> list:
+    """
+    Integer equivalent of ipaddress.collapse_addresses(): merge adjacent, overlapping and contained prefixes into the
+    minimal list of CIDR blocks covering the same addresses. Linear after the sort. Host bits in networks are ignored.
+    :param networks: sequence or numpy array of int network addresses
+    :param prefixes: sequence or numpy array of int prefix lengths, same length as networks
+    :param version: int IP version, 4 or 6 (numpy is only used for 4)
+    :return: list of (network int, prefix int) tuples sorted by network
+    """
+    if len(networks) != len(prefixes):
+        raise ValueError(f'networks and prefixes differ in length: {len(networks)} != {len(prefixes)}')
+    bits = _version_bits(version)
+
+    if (version == 4) and (_numpy() is not None):
+        intervals = _merge_intervals_numpy(networks, prefixes)
+    else:
+        intervals = _merge_intervals(networks, prefixes, bits)
+
+    collapsed = []
+    for start, end in intervals:
+        collapsed.extend(_range_to_prefixes(start, end, bits))
+    return collapsed
+
+
+def range_to_cidrs(start: int, end: int, version: int = 4):
+    """
+    Decompose the inclusive address range start-end into its minimal list of CIDR blocks.
+    Each block is found from the trailing zero bits of the current start and the bit_length of what remains,
+    so the cost is at most 2 blocks per address bit (O(32) for IPv4, O(128) for IPv6) regardless of range size.
+    :param start: int first address of the range
+    :param end: int last address of the range
+    :param version: int IP version, 4 or 6
+    :return: generator of (network int, prefix int) tuples in address order
+    """
+    bits = _version_bits(version)
+    _check_range(start, end, bits)
+    return _range_to_prefixes(start, end, bits)
+
+
+def ranges_to_cidrs(starts, ends, version: int = 4):
+    """
+    Batch version of range_to_cidrs() for sequences or numpy arrays of range endpoints.
+    :return: generator of (network int, prefix int) tuples, streamed range by range in input order
+    """
+    numpy = _numpy()
+    if len(starts) != len(ends):
+        raise ValueError(f'starts and ends differ in length: {len(starts)} != {len(ends)}')
+    bits = _version_bits(version)
+    if numpy is not None:
+        # iterating Python ints is much faster than iterating numpy scalars
+        starts = starts.tolist() if isinstance(starts, numpy.ndarray) else starts
+        ends = ends.tolist() if isinstance(ends, numpy.ndarray) else ends
+    for start, end in zip(starts, ends):
+        _check_range(start, end, bits)
+        yield from _range_to_prefixes(start, end, bits)
+
+
+def _check_range(start: int, end: int, bits: int):
+    if (start < 0) or (end >= (1 << bits)):
+        raise ValueError(f'Range {start}-{end} is outside of the IPv{4 if bits == 32 else 6} range')
+    if start > end:
+        raise ValueError(f'Range start {start} is after range end {end}')
+
+
+def _merge_intervals(networks, prefixes, bits: int) -> list:
+    """Return sorted, disjoint and non-adjacent (start, end) inclusive intervals covering the given prefixes"""
+    max_value = (1 << bits) - 1
+    intervals = []
+    for network, prefix in zip(networks, prefixes):
+        if (prefix < 0) or (prefix > bits):
+            raise ValueError(f'{prefix} is not a valid CIDR bit count')
+        if (network < 0) or (network > max_value):
+            raise ValueError(f'Input value is outside of IP range: {network}')
+        host_mask = (1 << (bits - prefix)) - 1
+        start = network & (max_value ^ host_mask)
+        intervals.append((start, start | host_mask))
+    intervals.sort()
+
+    merged = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _merge_intervals_numpy(networks, prefixes) -> list:
+    """IPv4 version of _merge_intervals() that sorts and merges with numpy. Ends are exclusive while merging."""
+    numpy = _numpy()
+    networks = numpy.asarray(networks, dtype=numpy.int64)
+    prefixes = numpy.asarray(prefixes, dtype=numpy.int64)
+    if not networks.size:
+        return []
+    if (prefixes.min() < 0) or (prefixes.max() > 32):
+        raise ValueError('prefixes must be valid CIDR bit counts (0-32)')
+    if (networks.min() < 0) or (networks.max() > V4_MAX_VALUE):
+        raise ValueError('networks must be in the IPv4 range')
+
+    sizes = numpy.left_shift(1, 32 - prefixes)
+    starts = networks & ~(sizes - 1)
+    order = numpy.argsort(starts, kind='stable')
+    starts = starts[order]
+    ends = numpy.maximum.accumulate(starts + sizes[order])
+    # a new interval begins wherever a start is past everything before it (adjacent counts as touching)
+    new_interval = numpy.empty(starts.size, dtype=bool)
+    new_interval[0] = True
+    new_interval[1:] = starts[1:] > ends[:-1]
+    last_in_interval = numpy.empty(starts.size, dtype=bool)
+    last_in_interval[:-1] = new_interval[1:]
+    last_in_interval[-1] = True
+    return list(zip(starts[new_interval].tolist(), (ends[last_in_interval] - 1).tolist()))
+
+
+def _range_to_prefixes(start: int, end: int, bits: int):
+    """Yield the (network, prefix) tuples of the minimal CIDR cover of the inclusive range start-end"""
+    while start <= end:
+        # the largest block is limited both by the alignment of start and by the remaining size of the range
+        alignment_bits = ((start & -start).bit_length() - 1) if start else bits
+        block_bits = min(alignment_bits, (end - start + 1).bit_length() - 1)
+        yield start, bits - block_bits
+        start += 1 << block_bits
+
+
+def _version_bits(version: int) -> int:
+    if version == 4:
+        return 32
+    elif version == 6:
+        return 128
+    raise ValueError(f'version must be 4 or 6, got {version}')
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Special-purpose address classification. The IANA IPv4/IPv6 Special-Purpose Address Registries (plus multicast) are
+compiled once into a table of disjoint, sorted intervals, so each lookup is a single bisect instead of the scans over
+network objects done by ipaddress's is_private and similar properties.
+"""
+
+import array
+import bisect
+import ipaddress
+from .globals import ADDRCATEGORY, V4_MAX_VALUE
+from .lazy import optional_import
+
+_numpy = optional_import('numpy')  # when None, classify_batch() bisects in a loop instead
+
+
+# (network, prefix, categories) entries, overlapping entries combine their categories
+V4_SPECIAL_NETWORKS = (
+    ('0.0.0.0', 8, ADDRCATEGORY.RESERVED),
+    ('0.0.0.0', 32, ADDRCATEGORY.UNSPECIFIED),
+    ('10.0.0.0', 8, ADDRCATEGORY.PRIVATE),
+    ('100.64.0.0', 10, ADDRCATEGORY.SHARED),
+    ('127.0.0.0', 8, ADDRCATEGORY.LOOPBACK),
+    ('169.254.0.0', 16, ADDRCATEGORY.LINK_LOCAL),
+    ('172.16.0.0', 12, ADDRCATEGORY.PRIVATE),
+    ('192.0.0.0', 24, ADDRCATEGORY.RESERVED),
+    ('192.0.2.0', 24, ADDRCATEGORY.DOCUMENTATION),
+    ('192.88.99.0', 24, ADDRCATEGORY.RESERVED),
+    ('192.168.0.0', 16, ADDRCATEGORY.PRIVATE),
+    ('198.18.0.0', 15, ADDRCATEGORY.BENCHMARKING),
+    ('198.51.100.0', 24, ADDRCATEGORY.DOCUMENTATION),
+    ('203.0.113.0', 24, ADDRCATEGORY.DOCUMENTATION),
+    ('224.0.0.0', 4, ADDRCATEGORY.MULTICAST),
+    ('240.0.0.0', 4, ADDRCATEGORY.RESERVED),
+    ('255.255.255.255', 32, ADDRCATEGORY.BROADCAST),
+)
+
+V6_SPECIAL_NETWORKS = (
+    ('::', 128, ADDRCATEGORY.UNSPECIFIED),
+    ('::1', 128, ADDRCATEGORY.LOOPBACK),
+    ('::ffff:0:0', 96, ADDRCATEGORY.IPV4_MAPPED),
+    ('64:ff9b::', 96, ADDRCATEGORY.TRANSLATION),
+    ('64:ff9b:1::', 48, ADDRCATEGORY.TRANSLATION),
+    ('100::', 64, ADDRCATEGORY.RESERVED),
+    ('2001::', 32, ADDRCATEGORY.RESERVED),
+    ('2001:2::', 48, ADDRCATEGORY.BENCHMARKING),
+    ('2001:10::', 28, ADDRCATEGORY.RESERVED),
+    ('2001:db8::', 32, ADDRCATEGORY.DOCUMENTATION),
+    ('3fff::', 20, ADDRCATEGORY.DOCUMENTATION),
+    ('fc00::', 7, ADDRCATEGORY.PRIVATE),
+    ('fe80::', 10, ADDRCATEGORY.LINK_LOCAL),
+    ('fec0::', 10, ADDRCATEGORY.RESERVED),
+    ('ff00::', 8, ADDRCATEGORY.MULTICAST),
+)
+
+
+def classify_address(address: int, version: int = 4) -> ADDRCATEGORY:
+    """
+    Return the special-purpose categories of an int address, ADDRCATEGORY.NONE for ordinary global unicast.
+    IPv4-mapped IPv6 addresses also get the categories of the IPv4 address they carry.
+    """
+    starts, categories = _tables(version)
+    if (address < 0) or (address > starts.max_value):
+        raise ValueError(f'Input value is outside of IPv{version} range: {address}')
+    category = categories[bisect.bisect_right(starts, address) - 1]
+    if category & ADDRCATEGORY.IPV4_MAPPED:
+        category |= classify_address(address & V4_MAX_VALUE)
+    return category
+
+
+def classify_batch(addresses, version: int = 4):
+    """
+    classify_address() for many addresses at once. IPv4 uses numpy.searchsorted when numpy is installed.
+    :param addresses: uint32 array (or sequence of int) of IPv4 addresses, or sequence of int IPv6 addresses
+    :param version: int IP version, 4 or 6
+    :return: uint16 numpy array (array.array without numpy) of ADDRCATEGORY values
+    """
+    numpy = _numpy()
+    starts, categories = _tables(version)
+    if numpy is not None and version == 4:
+        addresses = numpy.asarray(addresses)
+        if addresses.size and ((addresses.min() < 0) or (addresses.max() > V4_MAX_VALUE)):
+            raise ValueError('Input values are outside of IPv4 range')
+        indexes = numpy.searchsorted(numpy.array(starts, dtype=numpy.uint32), addresses.astype(numpy.uint32),
+                                     side='right') - 1
+        return numpy.array(categories, dtype=numpy.uint16)[indexes]
+
+    result = array.array('H', [classify_address(address, version) for address in addresses])
+    if numpy is not None:
+        return numpy.frombuffer(result, dtype=numpy.uint16)
+    return result
+
+
+def classify_network(network: int, prefix: int, version: int = 4) -> ADDRCATEGORY:
+    """
+    Return the categories shared by every address of a network (host bits are ignored),
+    so 10.1.0.0/16 is PRIVATE while 0.0.0.0/0 is NONE.
+    """
+    starts, categories = _tables(version)
+    bits = 32 if version == 4 else 128
+    if (prefix < 0) or (prefix > bits):
+        raise ValueError(f'{prefix} is not a valid CIDR bit count')
+    host_bits = bits - prefix
+    network = (network >> host_bits) << host_bits
+    if (network < 0) or (network > starts.max_value):
+        raise ValueError(f'Input value is outside of IPv{version} range: {network}')
+
+    first = bisect.bisect_right(starts, network) - 1
+    last = bisect.bisect_right(starts, network | ((1 << host_bits) - 1)) - 1
+    category = categories[first]
+    for index in range(first + 1, last + 1):
+        category &= categories[index]
+    if prefix >= 96 and category & ADDRCATEGORY.IPV4_MAPPED:
+        category |= classify_network(network & V4_MAX_VALUE, prefix - 96)
+    return category
+
+
+def format_category(category: int) -> str:
+    """Return the names of the categories joined by '|', 'NONE' for ordinary global unicast"""
+    category_str = _category_strs.get(category)
+    if category_str is None:
+        names = [member.name for member in ADDRCATEGORY if member and (category & member)]
+        category_str = _category_strs[category] = '|'.join(names) or ADDRCATEGORY.NONE.name
+    return category_str
+
+
+class _Starts(list):
+    """Sorted interval starts, with the top of the address space they cover"""
+    __slots__ = ('max_value',)
+
+
+def _compile(special_networks, bits: int) -> tuple:
+    """
+    Turn possibly overlapping networks into disjoint intervals covering the whole address space.
+    :return: (_Starts, list of ADDRCATEGORY) where categories[i] applies from starts[i] up to starts[i + 1]
+    """
+    intervals = []
+    for network_str, prefix, category in special_networks:
+        network = int(ipaddress.ip_network(f'{network_str}/{prefix}').network_address)
+        intervals.append((network, network + (1 << (bits - prefix)), category))
+    boundaries = sorted({0}.union(*((start, end) for start, end, _ in intervals)) - {1 << bits})
+
+    starts = _Starts()
+    starts.max_value = (1 << bits) - 1
+    categories = []
+    for boundary in boundaries:
+        category = ADDRCATEGORY.NONE
+        for start, end, network_category in intervals:
+            if start <= boundary < end:
+                category |= network_category
+        if not categories or category != categories[-1]:
+            starts.append(boundary)
+            categories.append(category)
+    return starts, categories
+
+
+def _tables(version: int) -> tuple:
+    tables = _compiled_tables.get(version)
+    if tables is None:
+        if version == 4:
+            tables = _compile(V4_SPECIAL_NETWORKS, 32)
+        elif version == 6:
+            tables = _compile(V6_SPECIAL_NETWORKS, 128)
+        else:
+            raise ValueError(f'version must be 4 or 6, got {version}')
+        _compiled_tables[version] = tables
+    return tables
+
+
+_category_strs = {}
+_compiled_tables = {}
@@ -19,8 +19,13 @@
 # If not, see <https://www.gnu.org/licenses/>.
 
 
+import array
+import sys
 from .convregex import *
 from .globals import *
+from .lazy import optional_import
+
+_numpy = optional_import('numpy')  # when None, bulk functions return array.array instead
 
 
 def cidrToDec(input_value) -> int:
@@ -30,8 +35,8 @@ def cidrToDec(input_value) -> int:
         int_value = input_value
     else:
         raise TypeError(f'expected decimal str or int, got type {type(input_value)} with value {input_value}')
-    if int_value in V4_CIDR_BITCOUNTS:
-        return_value = (V4_MAX_VALUE << (32 - int_value)) & V4_MAX_VALUE
+    if 0 <= int_value <= 32:
+        return_value = V4_CIDR_MASKS[32 - int_value]
     else:
         raise ValueError(f'{input_value} is not a valid CIDR bit count')
     return return_value
@@ -66,13 +71,26 @@ def convertAddrStrToType(input_value: str, input_type: int, output_type: int, re
     :param reverse: bool for whether or not to reverse the byte-order
     :param safe: bool for whether or not to avoid raising exceptions
     :return: str converted value or '' on error/failure when safe is True
+    COLON (IPv6) values convert to and from DEC and HEX, with reverse applying to all 16 bytes.
     """
     return_value = ''
     try:
         if input_type == output_type:
             raise ValueError('output_type should be different than input_type')
 
-        if input_type == ADDRTYPE.DEC:
+        if input_type == ADDRTYPE.COLON:
+            if output_type == ADDRTYPE.DEC:
+                return_value = str(v6StrToDec(input_value, reverse))
+            elif output_type == ADDRTYPE.HEX:
+                # always all 16 bytes, so '::' is 32 zeros and reverse swaps the whole address
+                return_value = v6StrToDec(input_value, reverse).to_bytes(16, BIG).hex()
+        elif output_type == ADDRTYPE.COLON:
+            if input_type == ADDRTYPE.DEC:
+                int_value = int(input_value) if RECLIST[ADDRTYPE.DEC].fullmatch(input_value) else -1
+                return_value = decToV6Str(int_value, reverse)
+            elif input_type == ADDRTYPE.HEX:
+                return_value = decToV6Str(hexToDec(input_value), reverse)
+        elif input_type == ADDRTYPE.DEC:
             if output_type == ADDRTYPE.DOTTED:
                 return_value = decStrToDottedQuadStr(input_value, reverse)
             elif output_type == ADDRTYPE.HEX:
@@ -97,17 +115,32 @@ def convertAddrStrToType(input_value: str, input_type: int, output_type: int, re
         return return_value
 
 
-def convertMaskStrToType(input_value: str, input_type: int, output_type: int, safe: bool = False) -> str:
+def convertMaskStrToType(input_value: str, input_type: int, output_type: int, safe: bool = False,
+                         version: int = 4) -> str:
     """
     Be sure to use isValidIPv4() before this to sanity-check your input!
     :param input_value: str value to convert
     :param input_type: int value type from MASKTYPE enum determining what the source type is
     :param output_type: int value type from the MASKTYPE enum determining what the destination type is
     :param safe: bool for whether or not to avoid raising exceptions
+    :param version: int IP version of the mask, 4 or 6 (for 6, MASKTYPE.DOTTED is the colon-separated form)
     :return: str converted value or '' on error/failure when safe is True
     """
+    if input_type != output_type:
+        # canonical representations of the 33 IPv4 and 129 IPv6 masks are answered from a table computed on first use
+        if not _mask_str_index:
+            _mask_str_index.update(_build_mask_str_index())
+        representations = _mask_str_index.get((version, input_type, input_value))
+        if representations is not None:
+            return representations.get(output_type, '')
+    if version == 6:
+        return _convertV6MaskStr(input_value, input_type, output_type, safe)
+    return _convertMaskStr(input_value, input_type, output_type, safe)
+
+
+def _convertMaskStr(input_value: str, input_type: int, output_type: int, safe: bool = False) -> str:
+    """Computed conversion for convertMaskStrToType(), used for input not found in _mask_str_index"""
     return_value = ''
-    reverse = False
     try:
         if input_type == output_type:
             raise ValueError('output_type should be different than input_type')
@@ -133,6 +166,15 @@ def convertMaskStrToType(input_value: str, input_type: int, output_type: int, sa
                 return_value = hexToDecCIDRStr(input_value)
             elif output_type == MASKTYPE.DOTTED:
                 return_value = decStrToDottedQuadStr(hexToDecCIDRStr(input_value))
+        elif input_type == MASKTYPE.DEC:
+            if not input_value.isdecimal():
+                raise ValueError(f'{input_value} is not a decimal mask')
+            if output_type == MASKTYPE.CIDR:
+                return_value = decToCIDRStr(input_value)
+            elif output_type == MASKTYPE.DOTTED:
+                return_value = decToDottedQuadStr(cidrToDec(decToCIDR(input_value)))
+            elif output_type == MASKTYPE.HEX:
+                return_value = decStrToHexStr(cidrToDecStr(decToCIDR(input_value)))
     except ValueError:
         if not safe:
             raise
@@ -142,6 +184,49 @@ def convertMaskStrToType(input_value: str, input_type: int, output_type: int, sa
         return return_value
 
 
+def _convertV6MaskStr(input_value: str, input_type: int, output_type: int, safe: bool = False) -> str:
+    """Computed conversion for convertMaskStrToType() with version 6, used for input not found in _mask_str_index"""
+    try:
+        if input_type == output_type:
+            raise ValueError('output_type should be different than input_type')
+
+        if input_type == MASKTYPE.CIDR:
+            if not (input_value.isdecimal() and (int(input_value) <= 128)):
+                raise ValueError(f'{input_value} is not a valid IPv6 prefix length')
+            mask_value = V6_CIDR_MASKS[128 - int(input_value)]
+        elif input_type == MASKTYPE.DEC:
+            if not input_value.isdecimal():
+                raise ValueError(f'{input_value} is not a decimal mask')
+            mask_value = int(input_value)
+        elif input_type == MASKTYPE.HEX:
+            mask_value = hexToDec(input_value)
+        elif input_type == MASKTYPE.DOTTED:
+            mask_value = v6StrToDec(input_value)
+        else:
+            return ''
+        if mask_value not in V6_CIDR_MASK_BITCOUNTS:
+            raise ValueError(f'{input_value} is not a valid IPv6 mask')
+    except ValueError:
+        if not safe:
+            raise
+        else:
+            return ''
+    else:
+        return _v6MaskToStr(mask_value, output_type)
+
+
+def _v6MaskToStr(mask_value: int, output_type: int) -> str:
+    if output_type == MASKTYPE.CIDR:
+        return str(V6_CIDR_MASK_BITCOUNTS[mask_value])
+    elif output_type == MASKTYPE.DEC:
+        return str(mask_value)
+    elif output_type == MASKTYPE.HEX:
+        return mask_value.to_bytes(16, BIG).hex()
+    elif output_type == MASKTYPE.DOTTED:
+        return decToV6Str(mask_value)
+    return ''
+
+
 def decStrToDottedQuadStr(input_value: str, reverse: bool = False) -> str:
     if RECLIST[ADDRTYPE.DEC].fullmatch(input_value):
         return decToDottedQuadStr(int(input_value), reverse)
@@ -178,10 +263,9 @@ def decToCIDR(input_value: int) -> int:
         int_value = input_value
     else:
         raise TypeError(f'expected decimal str or int, got type {type(input_value)} with value {input_value}')
-    if int_value not in V4_CIDR_MASKS:
+    if int_value not in V4_CIDR_MASK_BITCOUNTS:
         raise ValueError(f'{input_value} is not a valid CIDR mask')
-    cidr_value = bin(int_value).count('1')
-    return cidr_value
+    return V4_CIDR_MASK_BITCOUNTS[int_value]
 
 
 def decToCIDRStr(input_value) -> str:
@@ -192,9 +276,38 @@ def decToDottedQuadStr(input_value: int, reverse: bool = False) -> str:
     return '.'.join([str(octet) for octet in decToDottedQuadList(input_value, reverse)])
 
 
+def decArrayToDottedQuadStrList(input_values, reverse: bool = False) -> list:
+    """
+    Bulk version of decToDottedQuadStr() using a lookup table for the octet strings
+    :param input_values: uint32 numpy array, array.array or sequence of int
+    :param reverse: bool for whether or not to reverse the byte-order
+    :return: list of dotted-quad str
+    """
+    numpy = _numpy()
+    byte_order = LITTLE if reverse else BIG
+    if numpy is not None:
+        int_values = numpy.asarray(input_values)
+        if int_values.size and ((int_values.min() < 0) or (int_values.max() > V4_MAX_VALUE)):
+            raise ValueError('Input values are outside of IPv4 range')
+        raw_bytes = int_values.astype('>u4' if byte_order == BIG else '<u4').tobytes()
+    else:
+        try:
+            int_values = array.array('I', input_values)
+        except OverflowError:
+            raise ValueError('Input values are outside of IPv4 range') from None
+        if sys.byteorder != byte_order:
+            int_values.byteswap()
+        raw_bytes = int_values.tobytes()
+
+    octets = map(V4_OCTET_STRS.__getitem__, raw_bytes)
+    return [
+        f'{first}.{second}.{third}.{fourth}' for first, second, third, fourth in zip(octets, octets, octets, octets)
+    ]
+
+
 def dottedCIDRToHex(input_value: str):
-    dec_value = dottedQuadStrToDecStr(input_value)
-    if dec_value in V4_CIDR_MASKS:
+    dec_value = int(dottedQuadStrToDecStr(input_value))
+    if dec_value in V4_CIDR_MASK_BITCOUNTS:
         return dottedQuadStrToHexStr(input_value)
     else:
         raise ValueError(f'{input_value} is not a valid CIDR mask')
@@ -202,10 +315,9 @@ def dottedCIDRToHex(input_value: str):
 
 def dottedQuadStrToCIDR(input_value: str) -> int:
     dec_value = int(dottedQuadStrToDecStr(input_value))
-    if dec_value not in V4_CIDR_MASKS:
+    if dec_value not in V4_CIDR_MASK_BITCOUNTS:
         raise ValueError(f'{input_value} is not a valid CIDR mask')
-    cidr_value = decToCIDR(dec_value)
-    return cidr_value
+    return V4_CIDR_MASK_BITCOUNTS[dec_value]
 
 
 def dottedQuadStrToCIDRStr(input_value: str) -> str:
@@ -221,6 +333,39 @@ def dottedQuadStrToDecStr(input_value: str, reverse: bool = False) -> str:
     return str(int.from_bytes(split_value, byte_order))
 
 
+def dottedQuadStrListToDecArray(input_values, reverse: bool = False):
+    """
+    Bulk version of dottedQuadStrToDecStr() that parses all octets in one pass instead of per address.
+    Each value must have all four octets.
+    :param input_values: list of str, numpy str/bytes array, or a bytes buffer of newline-delimited addresses
+    :param reverse: bool for whether or not to reverse the byte-order
+    :return: uint32 numpy array, or array.array('I') when numpy is not installed
+    """
+    numpy = _numpy()
+    if isinstance(input_values, (bytes, bytearray, memoryview)):
+        values = bytes(input_values).split()
+    elif numpy is not None and isinstance(input_values, numpy.ndarray):
+        values = input_values.ravel().tolist()
+    else:
+        values = input_values
+    if not len(values):
+        return numpy.zeros(0, dtype=numpy.uint32) if numpy is not None else array.array('I')
+
+    separator = b'.' if isinstance(values[0], bytes) else '.'
+    if any(value.count(separator) != 3 for value in values):
+        raise ValueError('Input values must be dotted-quad addresses with four octets')
+    # bytes() raises ValueError for any octet outside of 0-255
+    raw_bytes = bytes(map(int, separator.join(values).split(separator)))
+
+    byte_order = LITTLE if reverse else BIG
+    if numpy is not None:
+        return numpy.frombuffer(raw_bytes, dtype='>u4' if byte_order == BIG else '<u4').astype(numpy.uint32)
+    int_values = array.array('I', raw_bytes)
+    if sys.byteorder != byte_order:
+        int_values.byteswap()
+    return int_values
+
+
 def dottedQuadStrToHexStr(input_value: str, reverse: bool = False) -> str:
     split_value = [int(value) for value in input_value.split('.')]
     if reverse:
@@ -246,7 +391,7 @@ def hexToDec(input_value: str, reverse: bool = False) -> int:
 
 def hexToDecCIDR(input_value: str):
     dec_value = hexToDec(input_value)
-    if dec_value in V4_CIDR_MASKS:
+    if dec_value in V4_CIDR_MASK_BITCOUNTS:
         return dec_value
     else:
         raise ValueError(f'{input_value} is not a valid CIDR mask')
@@ -259,3 +404,200 @@ def hexToDecCIDRStr(input_value: str):
 def hexToDecStr(hex_addr: str, reverse: bool = False) -> str:
     check_value = hexToDec(hex_addr, reverse)
     return '' if (check_value == -1) else str(check_value)
+
+
+def _build_mask_str_index() -> dict:
+    """
+    Map (version, MASKTYPE, str) of every valid mask to the str of each other MASKTYPE,
+    exactly as _convertMaskStr() or _convertV6MaskStr() gives
+    """
+    index = {}
+    mask_types = (MASKTYPE.DEC, MASKTYPE.HEX, MASKTYPE.DOTTED, MASKTYPE.CIDR)
+    for cidr_value in V4_CIDR_BITCOUNTS:
+        input_values = [(MASKTYPE.CIDR, str(cidr_value)), (MASKTYPE.DEC, cidrToDecStr(cidr_value))]
+        input_values.append((MASKTYPE.DOTTED, cidrToDottedQuadStr(cidr_value)))
+        input_values.append((MASKTYPE.HEX, dottedCIDRToHex(input_values[-1][1])))
+        for input_type, input_value in input_values:
+            index[(4, input_type, input_value)] = {
+                output_type: _convertMaskStr(input_value, input_type, output_type)
+                for output_type in mask_types if output_type != input_type
+            }
+    for mask_value in V6_CIDR_MASKS:
+        representations = {output_type: _v6MaskToStr(mask_value, output_type) for output_type in mask_types}
+        for input_type, input_value in representations.items():
+            index[(6, input_type, input_value)] = {
+                output_type: output_value
+                for output_type, output_value in representations.items() if output_type != input_type
+            }
+    return index
+
+
+_mask_str_index = {}  # filled by the first convertMaskStrToType() call, building it costs more than the import
+
+
+def decToV6Str(input_value: int, reverse: bool = False) -> str:
+    """
+    Format an int as a compressed IPv6 str (RFC 5952: lowercase, no leading zeros, the longest run of two or more
+    zero groups replaced by '::'). IPv4-mapped addresses are not given dotted-quad tails, the same as ipaddress.
+    """
+    if (input_value < 0) or (input_value > V6_MAX_VALUE):
+        raise ValueError(f'Input value is outside of IPv6 range: {input_value}')
+    if reverse:
+        input_value = int.from_bytes(input_value.to_bytes(16, BIG), LITTLE)
+    groups = [(input_value >> shift) & 0xffff for shift in range(112, -16, -16)]
+
+    # find the first longest run of zero groups
+    best_start = best_length = 0
+    run_start = run_length = 0
+    for index, group in enumerate(groups):
+        if group:
+            run_length = 0
+        else:
+            if not run_length:
+                run_start = index
+            run_length += 1
+            if run_length > best_length:
+                best_start, best_length = run_start, run_length
+
+    if best_length < 2:
+        return '%x:%x:%x:%x:%x:%x:%x:%x' % tuple(groups)
+    head = ':'.join(['%x' % group for group in groups[:best_start]])
+    tail = ':'.join(['%x' % group for group in groups[best_start + best_length:]])
+    return f'{head}::{tail}'
+
+
+def hiLoToV6StrList(high_values, low_values, reverse: bool = False) -> list:
+    """
+    Bulk version of decToV6Str() for addresses split into high and low 64-bit halves.
+    With numpy installed the groups and the zero run to compress are found with array operations, which leaves one
+    %-format per address, otherwise each address goes through decToV6Str().
+    :param high_values: uint64 numpy array, array.array('Q') or sequence of int with the upper 64 bits
+    :param low_values: the same for the lower 64 bits
+    :return: list of compressed IPv6 str
+    """
+    numpy = _numpy()
+    if len(high_values) != len(low_values):
+        raise ValueError(f'high and low values differ in length: {len(high_values)} != {len(low_values)}')
+    if numpy is None:
+        return [decToV6Str((high << 64) | low, reverse) for high, low in zip(high_values, low_values)]
+
+    high_values = numpy.asarray(high_values, dtype=numpy.uint64)
+    low_values = numpy.asarray(low_values, dtype=numpy.uint64)
+    if reverse:
+        # reversing all 16 bytes swaps the halves and the bytes within each
+        high_values, low_values = low_values.byteswap(), high_values.byteswap()
+    groups = numpy.empty((high_values.size, 8), dtype=numpy.uint16)
+    for index, shift in enumerate(range(48, -16, -16)):
+        groups[:, index] = (high_values >> numpy.uint64(shift)) & numpy.uint64(0xffff)
+        groups[:, index + 4] = (low_values >> numpy.uint64(shift)) & numpy.uint64(0xffff)
+
+    # length of the zero run starting at each group, argmax then gives the start of the first longest run
+    runs = numpy.zeros((high_values.size, 9), dtype=numpy.int8)
+    zero = groups == 0
+    for index in range(7, -1, -1):
+        runs[:, index] = (runs[:, index + 1] + 1) * zero[:, index]
+    best_start = runs.argmax(axis=1)
+    best_length = runs[numpy.arange(high_values.size), best_start]
+    # one pattern per (start, length) of the run to compress, 0 for none
+    patterns = numpy.where(best_length >= 2, best_start * 9 + best_length, 0)
+
+    results = numpy.empty(high_values.size, dtype=object)
+    for pattern in numpy.unique(patterns).tolist():
+        selected = numpy.flatnonzero(patterns == pattern)
+        if pattern:
+            start, length = divmod(pattern, 9)
+            columns = list(range(start)) + list(range(start + length, 8))
+            template = ':'.join(['%x'] * start) + '::' + ':'.join(['%x'] * (8 - start - length))
+        else:
+            columns = list(range(8))
+            template = '%x:%x:%x:%x:%x:%x:%x:%x'
+        results[selected] = [template % tuple(row) for row in groups[selected][:, columns].tolist()]
+    return results.tolist()
+
+
+def v6StrListToHiLo(input_values, reverse: bool = False) -> tuple:
+    """
+    Bulk version of v6StrToDec() that returns the addresses split into high and low 64-bit halves.
+    With numpy installed the strs are parsed to bytes by socket.inet_pton() and split into halves with numpy, any
+    str it rejects is passed to v6StrToDec() for the ValueError, otherwise each str goes through v6StrToDec().
+    :param input_values: list of str or numpy str array
+    :return: tuple of (high, low) uint64 numpy arrays, or array.array('Q') when numpy is not installed
+    """
+    numpy = _numpy()
+    if numpy is None:
+        int_values = [v6StrToDec(value, reverse) for value in input_values]
+        return (array.array('Q', [value >> 64 for value in int_values]),
+                array.array('Q', [value & 0xffffffffffffffff for value in int_values]))
+
+    import functools
+    import socket  # only needed here, so not an import-time cost of the module
+
+    if isinstance(input_values, numpy.ndarray):
+        input_values = input_values.ravel().tolist()
+    try:
+        packed = b''.join(map(functools.partial(socket.inet_pton, socket.AF_INET6), input_values))
+    except (OSError, TypeError, ValueError):
+        packed = b''.join([v6StrToDec(value).to_bytes(16, BIG) for value in input_values])
+    # read little-endian for reverse, which swaps the bytes within each half and then the halves themselves
+    halves = numpy.frombuffer(packed, dtype='<u8' if reverse else '>u8').reshape(-1, 2).astype(numpy.uint64)
+    if reverse:
+        return halves[:, 1].copy(), halves[:, 0].copy()
+    return halves[:, 0].copy(), halves[:, 1].copy()
+
+
+def v6StrToDec(input_value: str, reverse: bool = False) -> int:
+    """
+    Parse an IPv6 str, compressed or not and optionally with a dotted-quad IPv4 tail, into an int.
+    Accepts the same input as ipaddress.IPv6Address, except for scope IDs (the '%' suffix).
+    :raises ValueError: for invalid input
+    """
+    head, separator, tail = input_value.partition('::')
+    if separator:
+        head_groups = head.split(':') if head else []
+        tail_groups = tail.split(':') if tail else []
+    else:
+        head_groups = input_value.split(':')
+        tail_groups = []
+
+    # only the final group can be an IPv4 tail, which rules it out for addresses ending in '::'
+    last_groups = tail_groups if separator else head_groups
+    if last_groups and '.' in last_groups[-1]:
+        ipv4_value = _strictDottedQuadToDec(last_groups.pop())
+        last_groups += ['%x' % (ipv4_value >> 16), '%x' % (ipv4_value & 0xffff)]
+
+    group_count = len(head_groups) + len(tail_groups)
+    if (separator and (group_count > 7)) or ((not separator) and (group_count != 8)):
+        raise ValueError(f'{input_value} does not have a valid number of IPv6 groups')
+
+    value = 0
+    for group in head_groups:
+        value = (value << 16) | _v6GroupToDec(group, input_value)
+    value <<= 16 * (8 - group_count)
+    for group in tail_groups:
+        value = (value << 16) | _v6GroupToDec(group, input_value)
+    # each group stays within 16 bits, so value stays within 128 bits
+    if reverse:
+        value = int.from_bytes(value.to_bytes(16, BIG), LITTLE)
+    return value
+
+
+def _strictDottedQuadToDec(input_value: str) -> int:
+    """Dotted-quad parse with the ipaddress rules: four octets of 1-3 ASCII digits, no leading zeros, 0-255"""
+    octets = input_value.split('.')
+    if len(octets) != 4:
+        raise ValueError(f'{input_value} is not a dotted-quad IPv4 address')
+    value = 0
+    for octet in octets:
+        if not ((0 < len(octet) < 4) and octet.isascii() and octet.isdigit() and
+                ((octet[0] != '0') or (octet == '0')) and (int(octet) <= 255)):
+            raise ValueError(f'{input_value} is not a dotted-quad IPv4 address')
+        value = (value << 8) | int(octet)
+    return value
+
+
+def _v6GroupToDec(group: str, input_value: str) -> int:
+    # strip() removes all leading and trailing hex digits, so only an all-hex str ends up empty
+    if not ((0 < len(group) < 5) and group.isascii() and not group.strip('0123456789abcdefABCDEF')):
+        raise ValueError(f'{input_value} has an invalid IPv6 group: {group!r}')
+    return int(group, 16)
+
@@ -24,10 +24,22 @@ from .conversions import *
 
 class Converter(object):
     _supported_addr_types = [ADDRTYPE.DEC, ADDRTYPE.DOTTED, ADDRTYPE.HEX]
+    _supported_v6_addr_types = [ADDRTYPE.DEC, ADDRTYPE.COLON, ADDRTYPE.HEX]
 
-    def __init__(self, safe=True):
+    def __init__(self, safe=True, cache=None, version=4):
+        """
+        :param safe: bool for whether or not to avoid raising exceptions on invalid values
+        :param cache: optional cache.LRUCache to reuse conversions of values seen before
+        :param version: int IP version, 4 (DEC, DOTTED and HEX values) or 6 (DEC, COLON and HEX values)
+        """
+        if version not in (4, 6):
+            raise ValueError(f'version must be 4 or 6, got {version}')
         self.reverse = False
         self.safe = safe
+        self.version = version
+        self._cache = cache
+        if version == 6:
+            self._supported_addr_types = self._supported_v6_addr_types
         self._callbacks = {key: None for key in self._supported_addr_types}
         self._values = {key: '' for key in self._supported_addr_types}
 
@@ -62,10 +74,30 @@ class Converter(object):
     def run_conversions(self, addr_type: int):
         """Convert the currently stored value of addr_type to other types"""
         self._check_addr_type(addr_type)
-        for typeval in self._supported_addr_types:
-            if typeval != addr_type:
-                self._values[typeval] = convertAddrStrToType(
-                    self._values[addr_type], addr_type, typeval, reverse=self.reverse, safe=self.safe)
+        if self._cache is not None:
+            cache_key = (self._values[addr_type], addr_type, self.reverse, self.version)
+            converted = self._cache.get(cache_key)
+            if converted is not None:
+                self._values.update(converted)
+                return
+
+        value = self._values[addr_type]
+        if (self.version == 6) and (addr_type != ADDRTYPE.COLON):
+            # DEC and HEX are converted through COLON, so both stay 16-byte representations of the same address
+            value = convertAddrStrToType(value, addr_type, ADDRTYPE.COLON, reverse=self.reverse, safe=self.safe)
+            converted = ((ADDRTYPE.COLON, value),) + tuple(
+                (typeval, convertAddrStrToType(
+                    value, ADDRTYPE.COLON, typeval, reverse=self.reverse, safe=self.safe) if value else '')
+                for typeval in self._supported_addr_types if typeval not in (addr_type, ADDRTYPE.COLON)
+            )
+        else:
+            converted = tuple(
+                (typeval, convertAddrStrToType(value, addr_type, typeval, reverse=self.reverse, safe=self.safe))
+                for typeval in self._supported_addr_types if typeval != addr_type
+            )
+        self._values.update(converted)
+        if self._cache is not None:
+            self._cache.put(cache_key, converted)
 
     def set_value(self, value: str, addr_type: int):
         self._check_addr_type(addr_type)
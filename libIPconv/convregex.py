@@ -22,35 +22,64 @@
 import re
 
 
-# regex for matching decimal, dotted-quad and hex IP - including compiled versions for performance
+class _LazyPattern(object):
+    """
+    Stands in for re.compile(pattern, flags) and only compiles on first use, so importing this module stays cheap.
+    Methods such as fullmatch() are looked up once and then kept on the instance, later calls go straight to them.
+    """
+
+    def __init__(self, pattern, flags: int = 0):
+        self.pattern = pattern
+        self.flags = flags
+        self._compiled = None
+
+    def __getattr__(self, name):
+        if self._compiled is None:
+            self._compiled = re.compile(self.pattern, self.flags)
+        value = getattr(self._compiled, name)
+        if callable(value):
+            setattr(self, name, value)
+        return value
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.pattern!r})'
+
+
+# regex for matching decimal, dotted-quad and hex IP - including compiled versions (on first use) for performance
 DECIP_RE = r'^([0-9]{1,10})$'
-DECIP_REC = re.compile(DECIP_RE)
+DECIP_REC = _LazyPattern(DECIP_RE)
 
 HEXIP_RE = r'^((0[xX])?[0-9a-fA-F]{1,8})$'
-HEXIP_REC = re.compile(HEXIP_RE)
+HEXIP_REC = _LazyPattern(HEXIP_RE)
 
 # Requires 0-255 before and after each '.', up to 3 instances of '.'
 DOTTEDQUADIP_RE = r'^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){0,3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$'
-DOTTEDQUADIP_REC = re.compile(DOTTEDQUADIP_RE)
+DOTTEDQUADIP_REC = _LazyPattern(DOTTEDQUADIP_RE)
 
 IP_RELIST = [DECIP_RE, HEXIP_RE, DOTTEDQUADIP_RE]
 IP_RECLIST = [DECIP_REC, HEXIP_REC, DOTTEDQUADIP_REC]
 
 # Requires 0-255 before and after each '.' with 3 instances of '.'
 DOTTEDQUADIP_STRICTRE = r'^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$'
-DOTTEDQUADIP_STRICTREC = re.compile(DOTTEDQUADIP_STRICTRE)
+DOTTEDQUADIP_STRICTREC = _LazyPattern(DOTTEDQUADIP_STRICTRE)
+
+# bytes regex for finding dotted-quad IPs in larger text, with each octet captured in a group.
+# Digits or dots directly before or after (e.g. 1.2.3.4.5 or 1.2.3.4567) prevent a match.
+V4OCTET_RE = r'(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)'
+DOTTEDQUADIP_SEARCHRE = r'(?<![0-9.])' + r'\.'.join([V4OCTET_RE] * 4) + r'(?![0-9]|\.[0-9])'
+DOTTEDQUADIP_SEARCHREC = _LazyPattern(DOTTEDQUADIP_SEARCHRE.encode('ascii'))
 
 # Strict, does not allow for wildcard masks
 DOTTEDV4MASK_RE = r'^(((255\.){3}(255|254|252|248|240|224|192|128|0+))|((255\.){2}(255|254|252|248|240|224|192|128|0+)\.0)|((255\.)(255|254|252|248|240|224|192|128|0+)(\.0+){2})|((255|254|252|248|240|224|192|128|0+)(\.0+){3}))$'
-DOTTEDV4MASK_REC = re.compile(DOTTEDV4MASK_RE)
+DOTTEDV4MASK_REC = _LazyPattern(DOTTEDV4MASK_RE)
 
 
-# regex for matching general decimal and hex - including compiled versions for performance
+# regex for matching general decimal and hex - including compiled versions (on first use) for performance
 DEC_RE = r'^([0-9]+)$'
-DEC_REC = re.compile(DEC_RE)
+DEC_REC = _LazyPattern(DEC_RE)
 
 HEX_RE = r'^((0[xX])?[0-9a-fA-F]+)$'
-HEX_REC = re.compile(HEX_RE)
+HEX_REC = _LazyPattern(HEX_RE)
 
 RELIST = [DEC_RE, HEX_RE]
 RECLIST = [DEC_REC, HEX_REC]
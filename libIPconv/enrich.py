@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Headless enrichment of CSV or NDJSON rows of address/mask with the subnet_info() fields.
+Usage: python -m libIPconv.enrich [options] [input]   (see --help)
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import csv
+import io
+import json
+import os
+import sys
+from .conversions import convertMaskStrToType
+from .globals import ADDRTYPE, MASKTYPE, V4_MAX_VALUE
+from .subnetcalculator import v4_subnet_info
+from .validation import isValidIPv4Mask, scanIPv4
+
+
+# subnet_info() keys in the order they are appended to each row
+INFO_FIELDS = ('network_addr', 'broadcast_addr', 'first_addr', 'last_addr', 'netmask', 'prefix', 'usable')
+
+_empty_info = {key: '' for key in INFO_FIELDS}
+
+
+def mask_to_prefix(mask: str) -> int:
+    """
+    Return the CIDR prefix length of a mask in any representation convertMaskStrToType() accepts, or -1 if invalid.
+    Decimal values of 0-32 are taken as a CIDR prefix, larger ones as a decimal mask.
+    """
+    if mask.isascii() and mask.isdigit() and (len(mask) <= 2) and (int(mask) <= 32):
+        return int(mask)
+    for mask_type in (MASKTYPE.DOTTED, MASKTYPE.DEC, MASKTYPE.HEX):
+        if isValidIPv4Mask(mask, mask_type):
+            return int(convertMaskStrToType(mask, mask_type, MASKTYPE.CIDR))
+    return -1
+
+
+def subnet_fields(address: str, mask: str = '', addr_type: int = ADDRTYPE.DOTTED) -> dict:
+    """
+    subnet_info() fields for an address and a mask. When mask is empty the address can be in 'address/mask' form.
+    Invalid input gives '' for every field.
+    :param addr_type: int from the ADDRTYPE enum, DOTTED (the default) for dotted-quad addresses with all four octets
+                      only, NONE to also accept hex and decimal ones as isValidIPv4() does (so 'cafe' is an address)
+    """
+    if not mask:
+        address, _, mask = address.partition('/')
+    address = address.strip()
+    mask = mask.strip() or '32'
+    address_value = scanIPv4(address, addr_type, strict=True)
+    prefix = mask_to_prefix(mask)
+    if (address_value < 0) or (address_value > V4_MAX_VALUE) or (prefix < 0):
+        return _empty_info
+    return v4_subnet_info(address_value, prefix)
+
+
+def enrich_chunk(input_format: str, rows: list, address_key, mask_key, addr_type: int = ADDRTYPE.DOTTED) -> str:
+    """
+    Enrich a chunk of parsed rows and return them serialized. Runs in the worker processes.
+    CSV rows are lists indexed by address_key/mask_key, NDJSON rows are dicts keyed by them.
+    mask_key is None when the mask is part of the address value. Missing values count as ''.
+    addr_type is passed on to subnet_fields().
+    """
+    output = io.StringIO()
+    if input_format == 'csv':
+        writer = csv.writer(output, lineterminator='\n')
+        for row in rows:
+            address = row[address_key] if address_key < len(row) else ''
+            mask = row[mask_key] if (mask_key is not None) and (mask_key < len(row)) else ''
+            info = subnet_fields(address, mask, addr_type)
+            writer.writerow(row + [info[key] for key in INFO_FIELDS])
+    else:
+        for row in rows:
+            mask = str(row.get(mask_key, '')) if mask_key else ''
+            info = subnet_fields(str(row.get(address_key, '')), mask, addr_type)
+            for key in INFO_FIELDS:
+                row[key] = info[key]
+            output.write(json.dumps(row, separators=(',', ':')))
+            output.write('\n')
+    return output.getvalue()
+
+
+def iter_csv_rows(reader, width: int):
+    """Rows of a csv.reader without blank lines, with short rows padded to width so the added fields line up"""
+    for row in reader:
+        if row:
+            yield row + [''] * (width - len(row)) if len(row) < width else row
+
+
+def iter_ndjson_rows(input_file):
+    """JSON objects of the non-blank lines of input_file, raising ValueError naming the line for anything else"""
+    for line_number, line in enumerate(input_file, 1):
+        if line.strip():
+            try:
+                row = json.loads(line)
+            except ValueError as error:
+                raise ValueError(f'line {line_number}: invalid JSON: {error}') from None
+            if not isinstance(row, dict):
+                raise ValueError(f'line {line_number}: expected a JSON object, got {type(row).__name__}')
+            yield row
+
+
+def iter_chunks(rows, chunk_size: int):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run(input_file, output_file, input_format: str = 'csv', address_field: str = 'address',
+        mask_field: str = 'mask', workers: int = 0, chunk_size: int = 10000, any_format: bool = False):
+    """
+    Enrich every row of input_file and write them to output_file in input order.
+    Chunks are spread over a pool of worker processes, with at most two chunks per worker in flight,
+    so memory use is bounded by chunk_size no matter how large the input is.
+    :param input_file: text file object with a CSV header row or one JSON object per line
+    :param output_file: text file object for the enriched rows
+    :param input_format: str 'csv' or 'ndjson'
+    :param address_field: str name of the address column/key
+    :param mask_field: str name of the mask column/key, or '' when addresses are in 'address/mask' form
+    :param workers: int number of worker processes, 0 for one per CPU and 1 to work in this process
+    :param chunk_size: int number of rows per chunk
+    :param any_format: bool for whether or not hex and decimal addresses are accepted besides dotted-quad ones
+    :return: None
+    """
+    if input_format == 'csv':
+        reader = csv.reader(input_file)
+        header = next(reader, None)
+        if header is None:
+            return
+        try:
+            address_key = header.index(address_field)
+            mask_key = header.index(mask_field) if mask_field else None
+        except ValueError as error:
+            raise ValueError(f'missing CSV column: {error}') from None
+        csv.writer(output_file, lineterminator='\n').writerow(header + list(INFO_FIELDS))
+        rows = iter_csv_rows(reader, len(header))
+    elif input_format == 'ndjson':
+        address_key = address_field
+        mask_key = mask_field or None
+        rows = iter_ndjson_rows(input_file)
+    else:
+        raise ValueError(f'input_format must be csv or ndjson, got {input_format}')
+
+    addr_type = ADDRTYPE.NONE if any_format else ADDRTYPE.DOTTED
+    chunks = iter_chunks(rows, chunk_size)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in chunks:
+            output_file.write(enrich_chunk(input_format, chunk, address_key, mask_key, addr_type))
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append(executor.submit(enrich_chunk, input_format, chunk, address_key, mask_key, addr_type))
+            if len(pending) >= workers * 2:
+                output_file.write(pending.popleft().result())
+        while pending:
+            output_file.write(pending.popleft().result())
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m libIPconv.enrich', description='Append subnet information to CSV or NDJSON address/mask rows.'
+    )
+    parser.add_argument('input', nargs='?', default='-', help='input file, - for stdin (default)')
+    parser.add_argument('-o', '--output', default='-', help='output file, - for stdout (default)')
+    parser.add_argument('-f', '--format', choices=('csv', 'ndjson'), default='csv', help='input/output format')
+    parser.add_argument('-a', '--address-field', default='address', help='address column or key (default: address)')
+    parser.add_argument(
+        '-m', '--mask-field', default='mask',
+        help="mask column or key (default: mask), '' when the address field holds address/mask"
+    )
+    parser.add_argument(
+        '--any-format', action='store_true',
+        help='also accept hex (0a000001, 0x0A000001) and decimal (167772161) addresses, not just dotted-quad ones'
+    )
+    parser.add_argument('-w', '--workers', type=int, default=0, help='worker processes (default: one per CPU)')
+    parser.add_argument('-c', '--chunk-size', type=int, default=10000, help='rows per chunk (default: 10000)')
+    args = parser.parse_args(argv)
+    if args.workers < 0 or args.chunk_size < 1:
+        parser.error('--workers must be 0 or more and --chunk-size 1 or more')
+
+    input_file = sys.stdin if args.input == '-' else open(args.input, newline='', encoding='utf-8')
+    output_file = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    try:
+        run(input_file, output_file, args.format, args.address_field, args.mask_field, args.workers, args.chunk_size,
+            args.any_format)
+    except ValueError as error:
+        parser.exit(2, f'{parser.prog}: error: {error}\n')
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""This module contains generators for finding IPv4 addresses in large files without loading them into memory"""
+
+import mmap
+import os
+from .convregex import DOTTEDQUADIP_SEARCHREC
+
+
+DEFAULT_CHUNK_SIZE = 1 << 24  # 16 MiB
+
+# A match is at most 15 bytes and the look-ahead needs up to 2 more, so chunks are scanned with this much extra
+_CHUNK_OVERLAP = 17
+
+
+def iter_ipv4_file(path, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Lazily yield every dotted-quad IPv4 address in a file along with its byte offset.
+    The file is memory-mapped and scanned as bytes one chunk at a time, so memory use does not grow with file size.
+    :param path: path of the file to scan
+    :param chunk_size: int number of bytes to scan per chunk
+    :return: generator of (int byte offset, int address) tuples in file order
+    """
+    _check_chunk_size(chunk_size)
+    with open(path, 'rb') as file_object:
+        file_size = os.fstat(file_object.fileno()).st_size
+        if not file_size:
+            return  # empty files cannot be memory-mapped
+        with mmap.mmap(file_object.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for chunk_start in range(0, file_size, chunk_size):
+                chunk_end = chunk_start + chunk_size
+                # matches starting in this chunk can end past it, but not past the overlap
+                scan_end = min(file_size, chunk_end + _CHUNK_OVERLAP)
+                for match in DOTTEDQUADIP_SEARCHREC.finditer(mapped, chunk_start, scan_end):
+                    if match.start() >= chunk_end:
+                        break  # the next chunk will find this one
+                    yield match.start(), _match_to_int(match)
+
+
+def iter_ipv4_stream(stream, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Lazily yield every dotted-quad IPv4 address read from a binary stream (e.g. sys.stdin.buffer or a pipe)
+    along with its byte offset. Use iter_ipv4_file() for regular files.
+    :param stream: file-like object opened in binary mode
+    :param chunk_size: int number of bytes to read at a time
+    :return: generator of (int byte offset, int address) tuples in stream order
+    """
+    _check_chunk_size(chunk_size)
+    buffer = b''
+    buffer_offset = 0  # stream offset of buffer[0]
+    scan_start = 0
+    while True:
+        data = stream.read(chunk_size)
+        buffer += data
+        if data:
+            # leave the overlap for the next pass, since a match there could continue in the next read
+            scan_limit = len(buffer) - _CHUNK_OVERLAP
+            if scan_limit <= scan_start:
+                continue
+        else:
+            scan_limit = len(buffer)
+
+        for match in DOTTEDQUADIP_SEARCHREC.finditer(buffer, scan_start):
+            if match.start() >= scan_limit:
+                break
+            yield buffer_offset + match.start(), _match_to_int(match)
+
+        if not data:
+            return
+        # keep one byte before the next scan position so the look-behind can still see it
+        buffer = buffer[scan_limit - 1:]
+        buffer_offset += scan_limit - 1
+        scan_start = 1
+
+
+def _check_chunk_size(chunk_size: int):
+    if chunk_size < 1:
+        raise ValueError(f'chunk_size must be a positive int, got {chunk_size}')
+
+
+def _match_to_int(match) -> int:
+    first, second, third, fourth = match.groups()
+    return (int(first) << 24) | (int(second) << 16) | (int(third) << 8) | int(fourth)
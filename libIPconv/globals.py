@@ -36,9 +36,15 @@ V4_CIDR_BITCOUNTS = [x for x in range(33)]
 # (integer equivalents of 255.255.255.255, 255.255.255.254, 255.255.255.252, etc. down to 0.0.0.0)
 V4_CIDR_MASKS = [(V4_MAX_VALUE << offset) & V4_MAX_VALUE for offset in V4_CIDR_BITCOUNTS]
 
+# dict of bit-mask to CIDR bit count, for O(1) validity checks and lookups instead of scanning V4_CIDR_MASKS
+V4_CIDR_MASK_BITCOUNTS = {mask: 32 - offset for offset, mask in enumerate(V4_CIDR_MASKS)}
+
 # integer list of bit-masks for each octet of an IPv4 address
 V4_OCTET_MASKS = [255 << (8*octet_offset) for octet_offset in range(4)]
 
+# str representation of each possible octet value, used to format dotted-quad strings without calling str()
+V4_OCTET_STRS = [str(octet) for octet in range(256)]
+
 
 # 340282366920938463463374607431768211455 or ff:ff:ff:ff:ff:ff:ff:ff:ff:ff:ff:ff:ff:ff:ff:ff
 V6_MAX_VALUE = 0xffffffffffffffffffffffffffffffff
@@ -50,8 +56,11 @@ V6_CIDR_BITCOUNTS = [x for x in range(129)]
 # (integer equivalents of ff:ff:ff:ff:ff:ff:ff:ff:ff:ff:ff:ff:ff:ff:ff:ff, etc. down to ::)
 V6_CIDR_MASKS = [(V6_MAX_VALUE << offset) & V6_MAX_VALUE for offset in V6_CIDR_BITCOUNTS]
 
-# integer list of bit-masks for each octet of an IPv4 address
-V6_OCTET_MASKS = [255 << (8*octet_offset) for octet_offset in range(4)]
+# dict of bit-mask to CIDR bit count, for O(1) validity checks and lookups instead of scanning V6_CIDR_MASKS
+V6_CIDR_MASK_BITCOUNTS = {mask: 128 - offset for offset, mask in enumerate(V6_CIDR_MASKS)}
+
+# integer list of bit-masks for each octet of an IPv6 address
+V6_OCTET_MASKS = [255 << (8*octet_offset) for octet_offset in range(16)]
 
 
 # TODO: consolidate into representation types instead and change CIDR to PREFIX
@@ -63,6 +72,7 @@ class ADDRTYPE(enum.IntEnum):
     DEC = 0
     HEX = 1
     DOTTED = 2
+    COLON = 3  # IPv6 colon-separated hex groups
 
 @enum.unique
 class MASKTYPE(enum.IntEnum):
@@ -76,3 +86,20 @@ class MASKTYPE(enum.IntEnum):
 class VALTYPE(enum.IntEnum):
     ADDR = 16
     MASK = 32
+
+# special-purpose address categories (IANA IPv4/IPv6 Special-Purpose Address Registries), see classify.py
+@enum.unique
+class ADDRCATEGORY(enum.IntFlag):
+    NONE = 0  # ordinary global unicast
+    UNSPECIFIED = 1
+    LOOPBACK = 2
+    PRIVATE = 4  # RFC 1918 and IPv6 unique local
+    SHARED = 8  # carrier-grade NAT
+    LINK_LOCAL = 16
+    MULTICAST = 32
+    DOCUMENTATION = 64
+    BENCHMARKING = 128
+    RESERVED = 256
+    BROADCAST = 512
+    IPV4_MAPPED = 1024
+    TRANSLATION = 2048  # IPv4/IPv6 translation (NAT64)
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Opt-in instrumentation for libIPconv. enable() (or LIBIPCONV_INSTRUMENT=1 in the environment before libIPconv is
+imported) replaces the functions of conversions and validation and the methods of Converter and SubnetCalculator
+with wrappers counting calls, errors and wall time. Nothing is wrapped until then, so there is no cost when off.
+Times are inclusive: a function calling other instrumented functions also counts their time.
+"""
+
+import contextlib
+import cProfile
+import functools
+import importlib
+import io
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+import types
+
+ENV_VAR = 'LIBIPCONV_INSTRUMENT'
+
+# modules whose functions are instrumented, and (module, class) pairs whose methods are
+INSTRUMENTED_MODULES = ('conversions', 'validation')
+INSTRUMENTED_CLASSES = (('converter', 'Converter'), ('subnetcalculator', 'SubnetCalculator'))
+
+_lock = threading.Lock()
+_originals = {}  # wrapper: original function, while enabled
+_stats = {}  # name: [calls, errors, seconds], kept across disable() until reset()
+
+
+def disable():
+    """Put the original functions and methods back. Counters are kept until reset()"""
+    with _lock:
+        if not _originals:
+            return
+        for module in _package_modules():
+            for name, value in list(vars(module).items()):
+                if isinstance(value, types.FunctionType) and value in _originals:
+                    setattr(module, name, _originals[value])
+        for module_name, class_name in INSTRUMENTED_CLASSES:
+            cls = getattr(_import(module_name), class_name)
+            for name, value in list(vars(cls).items()):
+                if isinstance(value, types.FunctionType) and value in _originals:
+                    setattr(cls, name, _originals[value])
+        _originals.clear()
+
+
+def enable():
+    """Start counting calls and time of the instrumented functions and methods, see stats()"""
+    with _lock:
+        if _originals:
+            return
+        wrappers = {}  # original function: wrapper
+        for module_name in INSTRUMENTED_MODULES:
+            module = _import(module_name)
+            for name, value in list(vars(module).items()):
+                if isinstance(value, types.FunctionType) and value.__module__ == module.__name__:
+                    wrappers[value] = _wrap(f'{module_name}.{name}', value)
+        for module_name, class_name in INSTRUMENTED_CLASSES:
+            cls = getattr(_import(module_name), class_name)
+            for name, value in list(vars(cls).items()):
+                if isinstance(value, types.FunctionType) and not name.startswith('__'):
+                    wrapper = _wrap(f'{module_name}.{class_name}.{name}', value)
+                    setattr(cls, name, wrapper)
+
+        # the functions are also bound by name in every module that imported them (including the package itself)
+        for module in _package_modules():
+            for name, value in list(vars(module).items()):
+                if isinstance(value, types.FunctionType) and value in wrappers:
+                    setattr(module, name, wrappers[value])
+
+
+def is_enabled() -> bool:
+    return bool(_originals)
+
+
+@contextlib.contextmanager
+def profile(output=None, sort: str = 'cumulative', limit: int = 25):
+    """
+    Run the block under cProfile: with instrument.profile(sys.stderr) as profiler: ...
+    :param output: optional text stream the sorted pstats summary is written to when the block ends
+    :param sort: pstats sort key for the summary
+    :param limit: number of functions in the summary
+    :return: the cProfile.Profile, for pstats.Stats(profiler) after the block
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if output is not None:
+            pstats.Stats(profiler, stream=output).sort_stats(sort).print_stats(limit)
+
+
+def reset():
+    """Zero all counters"""
+    with _lock:
+        for counters in _stats.values():
+            counters[:] = [0, 0, 0.0]
+
+
+def stats() -> dict:
+    """
+    :return: dict of instrumented name (e.g. 'conversions.convertAddrStrToType') to a dict of 'calls', 'errors'
+     and 'seconds', for every function called at least once
+    """
+    with _lock:
+        return {
+            name: {'calls': calls, 'errors': errors, 'seconds': seconds}
+            for name, (calls, errors, seconds) in sorted(_stats.items()) if calls
+        }
+
+
+def to_prometheus(prefix: str = 'libipconv') -> str:
+    """Return stats() in the Prometheus text exposition format, as counters labelled by function"""
+    current = stats()
+    lines = []
+    for metric, key, help_text in (
+            ('calls_total', 'calls', 'Calls of instrumented libIPconv functions'),
+            ('errors_total', 'errors', 'Calls of instrumented libIPconv functions that raised'),
+            ('seconds_total', 'seconds', 'Wall time spent in instrumented libIPconv functions')):
+        lines.append(f'# HELP {prefix}_{metric} {help_text}')
+        lines.append(f'# TYPE {prefix}_{metric} counter')
+        for name, counters in current.items():
+            lines.append(f'{prefix}_{metric}{{function="{_escape_label(name)}"}} {counters[key]!r}')
+    return '\n'.join(lines) + '\n'
+
+
+@contextlib.contextmanager
+def trace_allocations(limit: int = 10, output=None):
+    """
+    Trace memory allocations made in the block with tracemalloc
+    :param limit: number of source lines in the 'top' list
+    :param output: optional text stream the summary is written to when the block ends
+    :return: dict filled in when the block ends with 'current_bytes' and 'peak_bytes' (relative to the start of the
+     block), 'top' (list of str, the source lines allocating the most) and 'snapshot' (tracemalloc.Snapshot)
+    """
+    result = {}
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start_bytes = tracemalloc.get_traced_memory()[0]
+    start_snapshot = tracemalloc.take_snapshot()
+    try:
+        yield result
+    finally:
+        current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        if not was_tracing:
+            tracemalloc.stop()
+        result.update({
+            'current_bytes': current_bytes - start_bytes, 'peak_bytes': peak_bytes - start_bytes,
+            'top': [str(stat) for stat in snapshot.compare_to(start_snapshot, 'lineno')[:limit]], 'snapshot': snapshot
+        })
+        if output is not None:
+            summary = io.StringIO()
+            summary.write(f"allocated {result['current_bytes']:,} bytes, peak {result['peak_bytes']:,} bytes\n")
+            summary.writelines(f'  {line}\n' for line in result['top'])
+            output.write(summary.getvalue())
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _import(module_name: str):
+    return importlib.import_module(f'.{module_name}', __package__)
+
+
+def _package_modules() -> list:
+    return [
+        module for name, module in list(sys.modules.items())
+        if module is not None and (name == __package__ or name.startswith(f'{__package__}.'))
+    ]
+
+
+def _wrap(name: str, function):
+    counters = _stats.setdefault(name, [0, 0, 0.0])
+    perf_counter = time.perf_counter
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        failed = True
+        try:
+            result = function(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            elapsed = perf_counter() - start
+            with _lock:
+                counters[0] += 1
+                counters[1] += failed
+                counters[2] += elapsed
+
+    _originals[wrapper] = function
+    return wrapper
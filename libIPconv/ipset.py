@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""This module contains IPSet, a set of IP addresses stored as sorted, disjoint intervals"""
+
+import bisect
+from .cidr import _version_bits, ranges_to_cidrs
+from .lazy import optional_import
+
+_numpy = optional_import('numpy')  # when None, intervals are kept in lists and combined with a plain Python sweep
+
+
+class IPSet(object):
+    """
+    Set of IPv4 or IPv6 addresses, stored as sorted, disjoint and non-adjacent inclusive (start, end) intervals.
+    Union, intersection and difference are a single sort-merge sweep over the interval boundaries of both sets.
+    With numpy installed, IPv4 intervals are int64 arrays and the sweep is vectorized. IPv6 intervals are lists of int,
+    whose sweep is vectorized over (high, low) uint64 halves of the boundaries when numpy is installed.
+    """
+    __slots__ = ('version', '_bits', '_starts', '_ends')
+
+    def __init__(self, starts=(), ends=(), version: int = 4):
+        """
+        :param starts: sequence or array of int first addresses of the ranges in the set, in any order
+        :param ends: sequence or array of int last addresses (inclusive) of the same ranges, which may overlap
+        :param version: int IP version, 4 or 6
+        """
+        if len(starts) != len(ends):
+            raise ValueError(f'starts and ends differ in length: {len(starts)} != {len(ends)}')
+        self.version = version
+        self._bits = _version_bits(version)
+        starts, ends = self._as_storage(starts), self._as_storage(ends)
+        if len(starts):
+            if self._vectorized:
+                out_of_range = (starts.min() < 0) or (ends.max() > (1 << self._bits) - 1)
+                reversed_range = (starts > ends).any()
+            else:
+                out_of_range = (min(starts) < 0) or (max(ends) > (1 << self._bits) - 1)
+                reversed_range = any(start > end for start, end in zip(starts, ends))
+            if out_of_range:
+                raise ValueError(f'ranges must be in the IPv{version} range')
+            if reversed_range:
+                raise ValueError('range starts must not be after their ends')
+        # combining with an empty set sorts and merges the input
+        self._starts, self._ends = self._combine(starts, ends, self._as_storage(()), self._as_storage(()), 'union')
+
+    @classmethod
+    def from_cidrs(cls, networks, prefixes, version: int = 4):
+        """
+        Build a set from sequences or arrays of network ints and prefix lengths. Host bits are ignored.
+        IPv4 blocks are masked with numpy when it is installed, IPv6 ones (beyond 64 bits) one at a time.
+        """
+        numpy = _numpy()
+        if len(networks) != len(prefixes):
+            raise ValueError(f'networks and prefixes differ in length: {len(networks)} != {len(prefixes)}')
+        bits = _version_bits(version)
+        if numpy is not None and version == 4:
+            networks = numpy.asarray(networks, dtype=numpy.int64)
+            prefixes = numpy.asarray(prefixes, dtype=numpy.int64)
+            invalid = (prefixes < 0) | (prefixes > bits)
+            if invalid.any():
+                raise ValueError(f'{prefixes[invalid][0]} is not a valid CIDR bit count')
+            host_masks = numpy.left_shift(1, bits - prefixes) - 1
+            return cls(networks & ~host_masks, networks | host_masks, version)
+
+        starts = []
+        ends = []
+        for network, prefix in zip(networks, prefixes):
+            if (prefix < 0) or (prefix > bits):
+                raise ValueError(f'{prefix} is not a valid CIDR bit count')
+            host_mask = (1 << (bits - prefix)) - 1
+            starts.append(network & ~host_mask)
+            ends.append(network | host_mask)
+        return cls(starts, ends, version)
+
+    @property
+    def _vectorized(self) -> bool:
+        return (self.version == 4) and (_numpy() is not None)
+
+    def __and__(self, other):
+        return self.intersection(other)
+
+    def __bool__(self):
+        return len(self._starts) > 0
+
+    def __contains__(self, address: int) -> bool:
+        position = bisect.bisect_right(self._starts, address) - 1
+        return position >= 0 and address <= self._ends[position]
+
+    def __eq__(self, other):
+        if not isinstance(other, IPSet):
+            return NotImplemented
+        return (self.version == other.version) and (self.intervals() == other.intervals())
+
+    def __iter__(self):
+        """Iterate over the (start, end) inclusive intervals of the set"""
+        return iter(self.intervals())
+
+    def __or__(self, other):
+        return self.union(other)
+
+    def __repr__(self):
+        return f'{type(self).__name__}(<{self.interval_count} intervals>, version={self.version})'
+
+    def __sub__(self, other):
+        return self.difference(other)
+
+    def contains_batch(self, addresses):
+        """Membership test for each address, as a numpy bool array for vectorized sets or a list of bool"""
+        numpy = _numpy()
+        if self._vectorized:
+            addresses = numpy.asarray(addresses, dtype=numpy.int64)
+            positions = numpy.searchsorted(self._starts, addresses, side='right') - 1
+            clipped = numpy.maximum(positions, 0)
+            if not len(self._starts):
+                return numpy.zeros(addresses.shape, dtype=bool)
+            return (positions >= 0) & (addresses <= self._ends[clipped])
+        return [address in self for address in addresses]
+
+    def difference(self, other):
+        """Return the addresses of this set that are not in other"""
+        return self._new(*self._combine(self._starts, self._ends, *self._other_storage(other), 'difference'))
+
+    def intersection(self, other):
+        """Return the addresses that are in both sets"""
+        return self._new(*self._combine(self._starts, self._ends, *self._other_storage(other), 'intersection'))
+
+    @property
+    def interval_count(self) -> int:
+        return len(self._starts)
+
+    def intervals(self) -> list:
+        """Return the (start, end) inclusive intervals of the set as a list of int tuples"""
+        if self._vectorized:
+            return list(zip(self._starts.tolist(), self._ends.tolist()))
+        return list(zip(self._starts, self._ends))
+
+    @property
+    def size(self) -> int:
+        """Number of addresses in the set"""
+        if self._vectorized:
+            return int((self._ends - self._starts).sum()) + len(self._starts)
+        return sum(self._ends) - sum(self._starts) + len(self._starts)
+
+    def to_cidrs(self):
+        """Return a generator of (network int, prefix int) tuples forming the minimal CIDR cover of the set"""
+        return ranges_to_cidrs(self._starts, self._ends, self.version)
+
+    def union(self, other):
+        """Return the addresses that are in either set"""
+        return self._new(*self._combine(self._starts, self._ends, *self._other_storage(other), 'union'))
+
+    def _as_storage(self, values):
+        numpy = _numpy()
+        if self._vectorized:
+            return numpy.asarray(values, dtype=numpy.int64)
+        return values.tolist() if (numpy is not None and isinstance(values, numpy.ndarray)) else list(values)
+
+    def _combine(self, starts_a, ends_a, starts_b, ends_b, operation: str) -> tuple:
+        """
+        Sweep over the boundaries of intervals a and b, which may overlap within each side when operation is union.
+        Between consecutive boundaries coverage by a and b is constant, so each such region is kept or dropped
+        according to operation and kept regions that touch are joined.
+        """
+        numpy = _numpy()
+        if self._vectorized:
+            return _combine_numpy(starts_a, ends_a, starts_b, ends_b, operation)
+        elif numpy is not None:
+            return _combine_numpy_v6(starts_a, ends_a, starts_b, ends_b, operation)
+
+        events = [(start, 1, 0) for start in starts_a] + [(end + 1, -1, 0) for end in ends_a]
+        events += [(start, 0, 1) for start in starts_b] + [(end + 1, 0, -1) for end in ends_b]
+        events.sort()
+        keep = _operations[operation]
+
+        starts = []
+        ends = []
+        coverage_a = coverage_b = 0
+        region_start = None  # start of the region being kept, if any
+        for index, (position, delta_a, delta_b) in enumerate(events):
+            coverage_a += delta_a
+            coverage_b += delta_b
+            if (index + 1 < len(events)) and (events[index + 1][0] == position):
+                continue  # apply every boundary at the same position before deciding
+            kept = keep(coverage_a > 0, coverage_b > 0)
+            if kept and region_start is None:
+                region_start = position
+            elif not kept and region_start is not None:
+                starts.append(region_start)
+                ends.append(position - 1)
+                region_start = None
+        return starts, ends
+
+    def _new(self, starts, ends):
+        new_set = IPSet.__new__(IPSet)
+        new_set.version = self.version
+        new_set._bits = self._bits
+        new_set._starts = starts
+        new_set._ends = ends
+        return new_set
+
+    def _other_storage(self, other) -> tuple:
+        if not isinstance(other, IPSet):
+            raise TypeError(f'expected IPSet, got type {type(other)}')
+        if other.version != self.version:
+            raise ValueError(f'cannot combine IPv{self.version} and IPv{other.version} sets')
+        return other._starts, other._ends
+
+
+# keep a region based on whether it is covered by (a, b)
+_operations = {
+    'difference': lambda in_a, in_b: in_a and not in_b,
+    'intersection': lambda in_a, in_b: in_a and in_b,
+    'union': lambda in_a, in_b: in_a or in_b
+}
+
+
+def _combine_numpy(starts_a, ends_a, starts_b, ends_b, operation: str) -> tuple:
+    """Vectorized IPSet._combine() for int64 arrays"""
+    numpy = _numpy()
+    positions = numpy.concatenate((starts_a, ends_a + 1, starts_b, ends_b + 1))
+    if not positions.size:
+        return positions, positions.copy()
+    ones_a = numpy.ones(starts_a.size, dtype=numpy.int64)
+    ones_b = numpy.ones(starts_b.size, dtype=numpy.int64)
+    zeros_a = numpy.zeros(starts_a.size, dtype=numpy.int64)
+    zeros_b = numpy.zeros(starts_b.size, dtype=numpy.int64)
+    deltas_a = numpy.concatenate((ones_a, -ones_a, zeros_b, zeros_b))
+    deltas_b = numpy.concatenate((zeros_a, zeros_a, ones_b, -ones_b))
+
+    order = numpy.argsort(positions, kind='stable')
+    positions = positions[order]
+    coverage_a = numpy.cumsum(deltas_a[order])
+    coverage_b = numpy.cumsum(deltas_b[order])
+    # coverage after the last boundary at each position holds until the next position
+    last = numpy.empty(positions.size, dtype=bool)
+    last[:-1] = positions[1:] != positions[:-1]
+    last[-1] = True
+    positions = positions[last]
+    in_a = coverage_a[last] > 0
+    in_b = coverage_b[last] > 0
+
+    if operation == 'union':
+        kept = in_a | in_b
+    elif operation == 'intersection':
+        kept = in_a & in_b
+    else:
+        kept = in_a & ~in_b
+    # nothing is covered after the last position, so only regions up to the next position can be kept
+    kept = kept[:-1]
+    starts = positions[:-1][kept]
+    ends = positions[1:][kept] - 1
+
+    if starts.size:
+        joined = numpy.empty(starts.size, dtype=bool)
+        joined[0] = False
+        joined[1:] = starts[1:] == ends[:-1] + 1
+        starts = starts[~joined]
+        ends = ends[numpy.append(~joined[1:], True)]
+    return starts, ends
+
+
+def _combine_numpy_v6(starts_a, ends_a, starts_b, ends_b, operation: str) -> tuple:
+    """
+    Vectorized IPSet._combine() for lists of IPv6 int. Boundaries are split into (high, low) uint64 columns, plus a
+    top column for the 2**128 that follows an interval ending at the last address, and sorted with lexsort.
+    """
+    numpy = _numpy()
+    one = numpy.uint64(1)
+    high_values, low_values = _split_v6(starts_a + starts_b)
+    end_high, end_low = _split_v6(ends_a + ends_b)
+    # the boundary after each end is end + 1, carried from the low into the high half and on into top
+    end_low = end_low + one
+    carry = end_low == 0
+    end_high = end_high + carry
+    end_top = carry & (end_high == 0)
+
+    count_a, count_b = len(starts_a), len(starts_b)
+    top = numpy.concatenate((numpy.zeros(count_a + count_b, dtype=bool), end_top))
+    high = numpy.concatenate((high_values, end_high))
+    low = numpy.concatenate((low_values, end_low))
+    if not low.size:
+        return [], []
+    ones_a = numpy.ones(count_a, dtype=numpy.int64)
+    ones_b = numpy.ones(count_b, dtype=numpy.int64)
+    zeros_a = numpy.zeros(count_a, dtype=numpy.int64)
+    zeros_b = numpy.zeros(count_b, dtype=numpy.int64)
+    # same order as the columns: starts of a and b, then ends of a and b
+    deltas_a = numpy.concatenate((ones_a, zeros_b, -ones_a, zeros_b))
+    deltas_b = numpy.concatenate((zeros_a, ones_b, zeros_a, -ones_b))
+
+    order = numpy.lexsort((low, high, top))
+    top, high, low = top[order], high[order], low[order]
+    coverage_a = numpy.cumsum(deltas_a[order])
+    coverage_b = numpy.cumsum(deltas_b[order])
+    last = numpy.empty(low.size, dtype=bool)
+    last[:-1] = (low[1:] != low[:-1]) | (high[1:] != high[:-1]) | (top[1:] != top[:-1])
+    last[-1] = True
+    high, low = high[last], low[last]
+    in_a = coverage_a[last] > 0
+    in_b = coverage_b[last] > 0
+
+    if operation == 'union':
+        kept = in_a | in_b
+    elif operation == 'intersection':
+        kept = in_a & in_b
+    else:
+        kept = in_a & ~in_b
+    kept = kept[:-1]
+    # a kept region never starts at 2**128, and its end (the next boundary - 1) always fits in 128 bits
+    start_high, start_low = high[:-1][kept], low[:-1][kept]
+    end_high, end_low = high[1:][kept], low[1:][kept]
+    end_high = end_high - (end_low == 0)
+    end_low = end_low - one
+
+    if start_low.size:
+        # a start joins the previous region when start - 1 is that region's end (starts after the first are > 0)
+        previous_high = start_high[1:] - (start_low[1:] == 0)
+        previous_low = start_low[1:] - one
+        joined = numpy.empty(start_low.size, dtype=bool)
+        joined[0] = False
+        joined[1:] = (previous_high == end_high[:-1]) & (previous_low == end_low[:-1])
+        start_high, start_low = start_high[~joined], start_low[~joined]
+        kept_ends = numpy.append(~joined[1:], True)
+        end_high, end_low = end_high[kept_ends], end_low[kept_ends]
+    return _join_v6(start_high, start_low), _join_v6(end_high, end_low)
+
+
+def _join_v6(high_values, low_values) -> list:
+    return [(high << 64) | low for high, low in zip(high_values.tolist(), low_values.tolist())]
+
+
+def _split_v6(values) -> tuple:
+    numpy = _numpy()
+    return (numpy.array([value >> 64 for value in values], dtype=numpy.uint64),
+            numpy.array([value & 0xffffffffffffffff for value in values], dtype=numpy.uint64))
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""This module contains helpers for deferring imports that are only needed by some of the functions of a module"""
+
+import importlib
+
+
+def optional_import(name: str):
+    """
+    Return a function that imports module name the first time it is called and returns it, or None when it is not
+    installed. Nothing is imported or put in sys.modules before that first call, so optional dependencies such as numpy
+    only cost import time for callers that reach code using them. Use in place of the try/import/except ImportError
+    idiom, calling the function where the module is needed:
+        _numpy = optional_import('numpy')
+        ...
+        numpy = _numpy()  # None when numpy is not installed
+    """
+    cache = []
+
+    def load():
+        if not cache:
+            try:
+                cache.append(importlib.import_module(name))
+            except ImportError:
+                cache.append(None)
+        return cache[0]
+    return load
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""This module contains a longest-prefix-match route table built on a multibit trie"""
+
+from .globals import V4_MAX_VALUE, V6_MAX_VALUE
+from .lazy import optional_import
+from .subnetcalculator import parse_network
+
+_numpy = optional_import('numpy')  # when None, lookup_batch() falls back to a loop over lookup_id()
+
+
+_STRIDE = 8  # bits consumed per trie level, giving 256 slots per node
+_SLOTS = 1 << _STRIDE
+
+
+class _Node(object):
+    """
+    One trie level. routes/lengths are only allocated once a prefix ends at this level; they hold the route id and
+    prefix length of the most specific prefix covering each slot (controlled prefix expansion).
+    """
+    __slots__ = ('children', 'lengths', 'routes')
+
+    def __init__(self):
+        self.children = {}
+        self.lengths = None
+        self.routes = None
+
+
+class RouteTable(object):
+    """
+    Longest-prefix-match table mapping IP prefixes to arbitrary values.
+    Lookups walk at most one trie level per 8 bits of address, so their cost depends on the address width only,
+    not on the number of prefixes in the table.
+    """
+
+    def __init__(self, version: int = 4):
+        if version not in (4, 6):
+            raise ValueError(f'version must be 4 or 6, got {version}')
+        self.version = version
+        self._bits = 32 if version == 4 else 128
+        self._max_value = V4_MAX_VALUE if version == 4 else V6_MAX_VALUE
+        self._default = -1  # route id of a /0 prefix
+        self._root = _Node()
+        self._route_ids = {}  # (network, prefix) -> route id
+        self._routes = []  # route id -> (network, prefix, value)
+        self._tables = None  # flattened trie for lookup_batch(), rebuilt after inserts
+
+    def __len__(self):
+        return len(self._routes)
+
+    @classmethod
+    def from_prefixes(cls, prefixes, version: int = 4):
+        """
+        Build a table from an iterable of (prefix, value) pairs.
+        Each prefix can be a str such as '10.0.0.0/8' or a (network int, prefix length int) tuple.
+        """
+        table = cls(version)
+        for prefix, value in prefixes:
+            network, prefix_len = parse_network(prefix, version) if isinstance(prefix, str) else prefix
+            table.insert(network, prefix_len, value)
+        return table
+
+    def insert(self, network: int, prefix: int, value) -> int:
+        """
+        Add a prefix or replace the value of an existing one. Host bits in network are ignored.
+        :return: int route id, usable with route()
+        """
+        if (network < 0) or (network > self._max_value):
+            raise ValueError(f'Input value is outside of IPv{self.version} range: {network}')
+        if (prefix < 0) or (prefix > self._bits):
+            raise ValueError(f'{prefix} is not a valid CIDR bit count')
+        network &= self._max_value ^ ((1 << (self._bits - prefix)) - 1)
+
+        route_id = self._route_ids.get((network, prefix))
+        if route_id is not None:
+            self._routes[route_id] = (network, prefix, value)
+            return route_id
+
+        route_id = len(self._routes)
+        self._routes.append((network, prefix, value))
+        self._route_ids[(network, prefix)] = route_id
+        self._tables = None
+
+        if not prefix:
+            self._default = route_id
+            return route_id
+
+        # walk/create the nodes down to the level holding the last bits of this prefix
+        node = self._root
+        level_count = (prefix - 1) // _STRIDE
+        for level in range(level_count):
+            slot = (network >> (self._bits - _STRIDE * (level + 1))) & (_SLOTS - 1)
+            child = node.children.get(slot)
+            if child is None:
+                child = node.children[slot] = _Node()
+            node = child
+
+        if node.routes is None:
+            node.routes = [-1] * _SLOTS
+            node.lengths = bytearray(_SLOTS)
+        level_end = _STRIDE * (level_count + 1)
+        first_slot = (network >> (self._bits - level_end)) & (_SLOTS - 1)
+        routes = node.routes
+        lengths = node.lengths
+        for slot in range(first_slot, first_slot + (1 << (level_end - prefix))):
+            if lengths[slot] <= prefix:
+                routes[slot] = route_id
+                lengths[slot] = prefix
+        return route_id
+
+    def lookup(self, address: int, default=None):
+        """Return the value of the longest prefix containing address, or default when none does"""
+        route_id = self.lookup_id(address)
+        return default if route_id < 0 else self._routes[route_id][2]
+
+    def lookup_batch(self, addresses, default=None) -> list:
+        """Return lookup() values for each address in a sequence or array"""
+        routes = self._routes
+        return [default if route_id < 0 else routes[route_id][2] for route_id in self.lookup_id_batch(addresses)]
+
+    def lookup_id(self, address: int) -> int:
+        """Return the route id of the longest prefix containing address, or -1 when none does"""
+        best = self._default
+        node = self._root
+        shift = self._bits - _STRIDE
+        while node is not None:
+            slot = (address >> shift) & (_SLOTS - 1)
+            if node.routes is not None and node.routes[slot] >= 0:
+                best = node.routes[slot]
+            node = node.children.get(slot)
+            shift -= _STRIDE
+        return best
+
+    def lookup_id_batch(self, addresses):
+        """
+        Return the lookup_id() of each address. For IPv4 with numpy installed, this is vectorized over a flattened
+        copy of the trie and returns an int32 array, otherwise a list.
+        """
+        numpy = _numpy()
+        if numpy is None or self.version != 4:
+            return [self.lookup_id(address) for address in addresses]
+
+        routes, children = self._flatten()
+        addresses = numpy.asarray(addresses, dtype=numpy.uint32)
+        best = numpy.full(addresses.shape, self._default, dtype=numpy.int32)
+        nodes = numpy.zeros(addresses.shape, dtype=numpy.int32)
+        for shift in range(self._bits - _STRIDE, -1, -_STRIDE):
+            slots = (addresses >> shift) & (_SLOTS - 1)
+            found = routes[nodes, slots]
+            best = numpy.where(found >= 0, found, best)
+            nodes = children[nodes, slots]
+        return best
+
+    def route(self, route_id: int) -> tuple:
+        """Return (network int, prefix int, value) for a route id"""
+        return self._routes[route_id]
+
+    def _flatten(self) -> tuple:
+        """Copy the trie into (routes, children) int32 tables indexed by [node, slot] for lookup_id_batch()"""
+        numpy = _numpy()
+        if self._tables is not None:
+            return self._tables
+
+        nodes = [self._root]
+        index = 0
+        while index < len(nodes):
+            nodes.extend(nodes[index].children.values())
+            index += 1
+        # the extra last row is an empty node that all missing children point to
+        empty = len(nodes)
+        routes = numpy.full((empty + 1, _SLOTS), -1, dtype=numpy.int32)
+        children = numpy.full((empty + 1, _SLOTS), empty, dtype=numpy.int32)
+        node_index = {id(node): position for position, node in enumerate(nodes)}
+        for position, node in enumerate(nodes):
+            if node.routes is not None:
+                routes[position] = node.routes
+            for slot, child in node.children.items():
+                children[position, slot] = node_index[id(child)]
+        self._tables = (routes, children)
+        return self._tables
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Asyncio server answering newline-delimited 'address/mask' queries with newline-delimited JSON subnet_info() results.
+Addresses must be dotted-quad, anything else (such as 'cafe/24') gets the invalid address error line.
+Usage: python -m libIPconv.server [--host HOST] [--port PORT | --unix PATH]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from .enrich import subnet_fields
+from .globals import ADDRTYPE
+
+
+MAX_LINE_LENGTH = 4096  # longer queries get an error response and are discarded
+
+_invalid_response = b'{"error":"invalid address or mask"}\n'
+_too_long_response = b'{"error":"query too long"}\n'
+
+
+class SubnetQueryProtocol(asyncio.Protocol):
+    """
+    Answers each query line with one JSON line, in order. All complete lines of a read are answered with a single
+    write, and reading is paused while the transport's write buffer is above its high-water mark.
+    """
+
+    def __init__(self):
+        self._buffer = b''
+        self._discarding = False  # inside an over-long line, until its newline arrives
+        self._transport = None
+
+    def connection_made(self, transport):
+        self._transport = transport
+
+    def data_received(self, data: bytes):
+        lines = (self._buffer + data).split(b'\n')
+        self._buffer = lines.pop()
+        responses = []
+        for line in lines:
+            if self._discarding:
+                self._discarding = False
+                continue
+            responses.append(_too_long_response if len(line) > MAX_LINE_LENGTH else query_response(line))
+        if len(self._buffer) > MAX_LINE_LENGTH:
+            if not self._discarding:
+                responses.append(_too_long_response)
+            self._buffer = b''
+            self._discarding = True
+        if responses:
+            self._transport.write(b''.join(responses))
+
+    def eof_received(self):
+        # a final query without a trailing newline is still answered, before the transport closes
+        if self._buffer and not self._discarding:
+            self._transport.write(query_response(self._buffer))
+        self._buffer = b''
+        return False
+
+    def pause_writing(self):
+        self._transport.pause_reading()
+
+    def resume_writing(self):
+        self._transport.resume_reading()
+
+
+def query_response(line: bytes) -> bytes:
+    """Return the JSON line answering a single query line, which must have a dotted-quad address"""
+    try:
+        query = line.decode('ascii').strip()
+    except UnicodeDecodeError:
+        return _invalid_response
+    info = subnet_fields(query, addr_type=ADDRTYPE.DOTTED)
+    if not info['prefix']:
+        return _invalid_response
+    return json.dumps(info, separators=(',', ':')).encode('ascii') + b'\n'
+
+
+async def start_server(host: str = '127.0.0.1', port: int = 8053, path: str = None):
+    """Start listening on a TCP host/port, or on a Unix socket when path is given, and return the asyncio Server"""
+    loop = asyncio.get_running_loop()
+    if path:
+        return await loop.create_unix_server(SubnetQueryProtocol, path)
+    return await loop.create_server(SubnetQueryProtocol, host, port)
+
+
+class SubnetQueryClient(object):
+    """Async client for the server, which sends a batch of queries in one write and reads back one line for each"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def connect(cls, host: str = '127.0.0.1', port: int = 8053, path: str = None):
+        if path:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+
+    async def query(self, queries: list) -> list:
+        """Send 'address/mask' str queries pipelined and return the decoded response dict for each"""
+        self._writer.write(''.join(f'{query}\n' for query in queries).encode('ascii'))
+        await self._writer.drain()
+        return [json.loads(await self._reader.readline()) for _ in queries]
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m libIPconv.server', description='Answer address/mask queries with subnet information as JSON.'
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='TCP address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8053, help='TCP port to listen on (default: 8053)')
+    parser.add_argument('--unix', metavar='PATH', help='listen on a Unix socket instead of TCP')
+    args = parser.parse_args(argv)
+
+    async def serve():
+        server = await start_server(args.host, args.port, args.unix)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -19,22 +19,272 @@
 # If not, see <https://www.gnu.org/licenses/>.
 
 
+import array
 import ipaddress
+import types
+from .classify import classify_network, format_category
+from .conversions import decArrayToDottedQuadStrList, decToV6Str, v6StrToDec
+from .globals import ADDRCATEGORY, V4_CIDR_MASKS, V4_MAX_VALUE, V6_CIDR_MASKS, V6_MAX_VALUE
+from .lazy import optional_import
+
+_numpy = optional_import('numpy')  # when None, batch functions fall back to array.array and plain loops
 
 
 network_classes = {4: ipaddress.IPv4Network, 6: ipaddress.IPv6Network}
 
+_empty_info = {
+    'broadcast_addr': '', 'first_addr': '', 'last_addr': '', 'netmask': '', 'network_addr': '', 'prefix': '',
+    'usable': ''
+}
+
+# keys of the integer columns returned by v4_subnet_info_batch(), 'prefix' being the uint8 input
+_batch_addr_keys = ('broadcast_addr', 'first_addr', 'last_addr', 'netmask', 'network_addr')
+
+# netmask for each prefix length, so it can be indexed with an array of prefixes
+_v4_prefix_masks = [V4_CIDR_MASKS[32 - prefix] for prefix in range(33)]
+
+
+def parse_network(value, version: int = 4) -> tuple:
+    """
+    Parse a network the way ipaddress does with strict=False, without keeping the ipaddress object.
+    Common 'address/prefix' and 'address' str values are parsed directly, anything else goes through ipaddress.
+    :param value: network in any form ipaddress.IPv4Network/IPv6Network accept
+    :param version: int IP version, 4 or 6
+    :return: tuple of (network int, prefix int) with host bits cleared
+    :raises ValueError: for invalid values
+    """
+    if (version == 4) and isinstance(value, str):
+        address, separator, prefix = value.partition('/')
+        octets = address.split('.')
+        if (len(octets) == 4) and ((not separator) or (prefix.isascii() and prefix.isdigit() and int(prefix) <= 32)):
+            network = 0
+            for octet in octets:
+                # same rules as ipaddress: 1-3 ASCII digits, no leading zeros, no more than 255
+                if not ((0 < len(octet) < 4) and octet.isascii() and octet.isdigit() and
+                        ((octet[0] != '0') or (octet == '0')) and (int(octet) <= 255)):
+                    break
+                network = (network << 8) | int(octet)
+            else:
+                prefix = int(prefix) if separator else 32
+                return network & V4_CIDR_MASKS[32 - prefix], prefix
+
+    elif (version == 6) and isinstance(value, str) and ('%' not in value):
+        address, separator, prefix = value.partition('/')
+        if (not separator) or (prefix.isascii() and prefix.isdigit() and int(prefix) <= 128):
+            try:
+                network = v6StrToDec(address)
+            except ValueError:
+                pass  # let ipaddress raise its usual error
+            else:
+                prefix = int(prefix) if separator else 128
+                return network & V6_CIDR_MASKS[128 - prefix], prefix
+
+    network_class = network_classes[version]
+    parsed = network_class(value, strict=False)
+    return int(parsed.network_address), parsed.prefixlen
+
+
+def subnet_info_from_int(network: int, prefix: int, version: int = 4, category: bool = False) -> dict:
+    """
+    Stateless equivalent of SubnetCalculator.subnet_info() for an int network (host bits are ignored) and prefix
+    :param category: bool for whether or not to add a 'category' value, see classify.classify_network()
+    :return: dict of str values
+    """
+    if category:
+        info = subnet_info_from_int(network, prefix, version)
+        info['category'] = format_category(classify_network(network, prefix, version))
+        return info
+    elif version == 4:
+        return v4_subnet_info(network, prefix)
+    elif version != 6:
+        raise ValueError(f'version must be 4 or 6, got {version}')
+
+    if (network < 0) or (network > V6_MAX_VALUE):
+        raise ValueError(f'Input value is outside of IPv6 range: {network}')
+    if (prefix < 0) or (prefix > 128):
+        raise ValueError(f'{prefix} is not a valid CIDR bit count')
+    netmask = V6_CIDR_MASKS[128 - prefix]
+    network_addr = network & netmask
+    broadcast_addr = network_addr | (netmask ^ V6_MAX_VALUE)
+    whole = prefix >= 127
+    return {
+        'broadcast_addr': decToV6Str(broadcast_addr),
+        'first_addr': decToV6Str(network_addr if whole else network_addr + 1),
+        'last_addr': decToV6Str(broadcast_addr if whole else broadcast_addr - 1), 'netmask': decToV6Str(netmask),
+        'network_addr': decToV6Str(network_addr), 'prefix': str(prefix),
+        'usable': str((broadcast_addr - network_addr + 1) if whole else (broadcast_addr - network_addr - 1))
+    }
+
+
+def subnet_info_from_value(value, version: int = 4, safe: bool = True, category: bool = False) -> dict:
+    """
+    Stateless equivalent of SubnetCalculator.set_value() followed by subnet_info()
+    :return: dict of str values, which are all '' for invalid values when safe is True
+    """
+    try:
+        return subnet_info_from_int(*parse_network(value, version), version, category)
+    except ValueError:
+        if not safe:
+            raise
+        return dict(_empty_info, category='') if category else dict(_empty_info)
+
+
+def subnet_info_threaded(values, version: int = 4, safe: bool = True, max_workers: int = None,
+                         chunk_size: int = 1000) -> list:
+    """
+    subnet_info_from_value() for each value using a thread pool, for callers that already run in threads.
+    Values are handed out in chunks to keep the per-task overhead low. Results are in input order.
+    """
+    import concurrent.futures  # only this function needs it, and it is slow to import
+
+    values = list(values)
+    chunks = [values[start:start + chunk_size] for start in range(0, len(values), chunk_size)]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(lambda chunk: [subnet_info_from_value(value, version, safe) for value in chunk], chunks)
+        return [info for chunk_results in results for info in chunk_results]
+
+
+def v4_subnet_info(address: int, prefix: int) -> dict:
+    """
+    Integer-only equivalent of SubnetCalculator.subnet_info() that never builds ipaddress objects.
+    Host bits in address are ignored, the same as set_value() does with strict=False.
+    :param address: int IPv4 address (0 - V4_MAX_VALUE)
+    :param prefix: int CIDR prefix length (0-32)
+    :return: dict with the same keys and str values as SubnetCalculator.subnet_info()
+    """
+    if (address < 0) or (address > V4_MAX_VALUE):
+        raise ValueError(f'Input value is outside of IPv4 range: {address}')
+    if (prefix < 0) or (prefix > 32):
+        raise ValueError(f'{prefix} is not a valid CIDR bit count')
+
+    netmask = V4_CIDR_MASKS[32 - prefix]
+    network_addr = address & netmask
+    broadcast_addr = network_addr | (netmask ^ V4_MAX_VALUE)
+    if prefix < 31:
+        first_addr = network_addr + 1
+        last_addr = broadcast_addr - 1
+        usable = broadcast_addr - network_addr - 1
+    else:
+        first_addr = network_addr
+        last_addr = broadcast_addr
+        usable = broadcast_addr - network_addr + 1
+
+    return {
+        'broadcast_addr': _v4_str(broadcast_addr), 'first_addr': _v4_str(first_addr),
+        'last_addr': _v4_str(last_addr), 'netmask': _v4_str(netmask), 'network_addr': _v4_str(network_addr),
+        'prefix': str(prefix), 'usable': str(usable)
+    }
+
+
+def v4_subnet_info_batch(addresses, prefixes) -> dict:
+    """
+    Columnar version of v4_subnet_info() for large numbers of address/prefix pairs.
+    With numpy installed the columns are computed with vectorized masking, otherwise array.array is used.
+    No strings are built here, pass the result to format_subnet_info_batch() if they are needed.
+    :param addresses: uint32 array (or sequence of int) of IPv4 addresses
+    :param prefixes: uint8 array (or sequence of int) of CIDR prefix lengths, same length as addresses
+    :return: dict with the keys of subnet_info() mapped to uint32 arrays ('prefix' is uint8)
+    """
+    numpy = _numpy()
+    if len(addresses) != len(prefixes):
+        raise ValueError(f'addresses and prefixes differ in length: {len(addresses)} != {len(prefixes)}')
+
+    if numpy is None:
+        return _v4_subnet_info_batch_array(addresses, prefixes)
+
+    # checked before the casts, which would otherwise wrap out-of-range values silently
+    addresses = _checked_column(addresses, numpy.uint32, V4_MAX_VALUE, 'Input value is outside of IPv4 range: {}')
+    prefixes = _checked_column(prefixes, numpy.uint8, 32, '{} is not a valid CIDR bit count')
+
+    netmask = numpy.array(_v4_prefix_masks, dtype=numpy.uint32)[prefixes]
+    hostmask = ~netmask
+    network_addr = addresses & netmask
+    broadcast_addr = network_addr | hostmask
+    # /31 and /32 have no network or broadcast address to exclude
+    whole = prefixes >= 31
+    one = numpy.uint32(1)
+
+    return {
+        'broadcast_addr': broadcast_addr,
+        'first_addr': numpy.where(whole, network_addr, network_addr + one),
+        'last_addr': numpy.where(whole, broadcast_addr, broadcast_addr - one),
+        'netmask': netmask,
+        'network_addr': network_addr,
+        'prefix': prefixes,
+        'usable': numpy.where(whole, hostmask + one, hostmask - one)
+    }
+
+
+def format_subnet_info_batch(columns: dict) -> dict:
+    """
+    Optional second pass over the result of v4_subnet_info_batch() that produces the str values of subnet_info()
+    :param columns: dict returned by v4_subnet_info_batch()
+    :return: dict with the same keys mapped to lists of str
+    """
+    formatted = {key: decArrayToDottedQuadStrList(columns[key]) for key in _batch_addr_keys}
+    formatted['prefix'] = [str(value) for value in columns['prefix'].tolist()]
+    formatted['usable'] = [str(value) for value in columns['usable'].tolist()]
+    return formatted
+
+
+def _checked_column(values, dtype, max_value: int, message: str):
+    """numpy array of values as dtype, raising ValueError with message formatted with the first value not in 0-max"""
+    numpy = _numpy()
+    values = numpy.asarray(values)
+    if values.dtype != dtype:
+        out_of_range = (values < 0) | (values > max_value)
+        if out_of_range.any():
+            raise ValueError(message.format(values[out_of_range][0]))
+        values = values.astype(dtype)
+    return values
+
+
+def _v4_subnet_info_batch_array(addresses, prefixes) -> dict:
+    columns = {key: array.array('I') for key in _batch_addr_keys + ('usable',)}
+    columns['prefix'] = array.array('B')
+    for address, prefix in zip(addresses, prefixes):
+        if (address < 0) or (address > V4_MAX_VALUE):
+            raise ValueError(f'Input value is outside of IPv4 range: {address}')
+        if (prefix < 0) or (prefix > 32):
+            raise ValueError(f'{prefix} is not a valid CIDR bit count')
+        netmask = _v4_prefix_masks[prefix]
+        network_addr = address & netmask
+        broadcast_addr = network_addr | (netmask ^ V4_MAX_VALUE)
+        whole = prefix >= 31
+        columns['broadcast_addr'].append(broadcast_addr)
+        columns['first_addr'].append(network_addr if whole else network_addr + 1)
+        columns['last_addr'].append(broadcast_addr if whole else broadcast_addr - 1)
+        columns['netmask'].append(netmask)
+        columns['network_addr'].append(network_addr)
+        columns['prefix'].append(prefix)
+        columns['usable'].append((broadcast_addr - network_addr + 1) if whole else (broadcast_addr - network_addr - 1))
+    return columns
+
+
+def _v4_str(value: int) -> str:
+    """Dotted-quad formatting without the range checks and list building of decToDottedQuadStr()"""
+    return f'{value >> 24}.{(value >> 16) & 255}.{(value >> 8) & 255}.{value & 255}'
+
 
 class SubnetCalculator(object):
-    def __init__(self, safe=True):
+    """
+    Holds the last value parsed by set_value() for subnet_info() and split().
+    The work is done by the stateless parse_network() and subnet_info_from_int(), which can be called directly
+    (and from any number of threads) instead of keeping a calculator per caller.
+    """
+
+    def __init__(self, safe=True, cache=None):
+        """
+        :param safe: bool for whether or not to avoid raising exceptions on invalid values
+        :param cache: optional cache.LRUCache to reuse subnet_info() results. Cached results are read-only mappings.
+        """
         self.safe = safe
-        self._value = None
+        self._cache = cache
+        self._value = None  # (network int, prefix int, version int)
 
     def set_value(self, value, version: int = 4) -> bool:
-        network_class = network_classes[version]
-        # TODO: handle different input representations to allow supporting more than ipaddress module does
         try:
-            self._value = network_class(value, strict=False)
+            self._value = parse_network(value, version) + (version,)
         except ValueError:
             if not self.safe:
                 raise
@@ -43,31 +293,230 @@ class SubnetCalculator(object):
 
         return True
 
-    def subnet_info(self) -> dict:
-        info_dict = {
-            'broadcast_addr': '', 'first_addr': '', 'last_addr': '', 'netmask': '', 'network_addr': '', 'prefix': '',
-            'usable': ''
-        }
+    def subnet_result(self):
+        """Return the current value as a SubnetInfo, or None when no value has been set successfully"""
         if self._value:
-            usable = (self._value.num_addresses - 2) if (self._value.num_addresses > 2) else self._value.num_addresses
-            first_addr = (
-                (self._value.network_address + 1) if (self._value.num_addresses > 2) else self._value.network_address
-            )
-            last_addr = (
-                (self._value.broadcast_address - 1) if (self._value.num_addresses > 2) else self._value.broadcast_address
-            )
-            try:
-                info_dict['broadcast_addr'] = f'{self._value.broadcast_address}'
-                info_dict['first_addr'] = f'{first_addr}'
-                info_dict['last_addr'] = f'{last_addr}'
-                info_dict['netmask'] = f'{self._value.netmask}'
-                info_dict['network_addr'] = f'{self._value.network_address}'
-                info_dict['prefix'] = f'{self._value.prefixlen}'
-                info_dict['usable'] = f'{usable}'
-            except ValueError:
-                if not self.safe:
-                    raise
+            return SubnetInfo(*self._value)
         elif not self.safe:
             raise AttributeError(f'Value has not yet been set successfully! Hint: call .set_value() first')
+        return None
+
+    def split(self, new_prefix: int):
+        """Return a lazy SubnetSplit of the current value into child networks of new_prefix length"""
+        if not self._value:
+            raise AttributeError(f'Value has not yet been set successfully! Hint: call .set_value() first')
+        return SubnetSplit(*self._value[:2], new_prefix, self._value[2])
+
+    def subnet_info(self, category: bool = False) -> dict:
+        """
+        :param category: bool for whether or not to add a 'category' value, see classify.classify_network()
+        :return: dict of str values, which are all '' when no value has been set successfully and safe is True
+        """
+        if self._value and (self._cache is not None):
+            cache_key = self._value + (category,)
+            cached_info = self._cache.get(cache_key)
+            if cached_info is None:
+                cached_info = types.MappingProxyType(subnet_info_from_int(*self._value, category))
+                self._cache.put(cache_key, cached_info)
+            return cached_info
+        elif self._value:
+            return subnet_info_from_int(*self._value, category)
+        elif not self.safe:
+            raise AttributeError(f'Value has not yet been set successfully! Hint: call .set_value() first')
+
+        return dict(_empty_info, category='') if category else dict(_empty_info)
+
+
+class SubnetInfo(object):
+    """
+    Compact, immutable alternative to the subnet_info() dict. Only the network, prefix and version are stored;
+    the other int values are derived and the str values formatted when their attribute is accessed.
+    info['network_addr'] style access and to_dict() give the same str values as subnet_info().
+    """
+    __slots__ = ('_network', '_prefix', '_version')
+
+    keys = ('broadcast_addr', 'first_addr', 'last_addr', 'netmask', 'network_addr', 'prefix', 'usable')
+
+    def __init__(self, network: int, prefix: int, version: int = 4):
+        """Host bits in network are ignored"""
+        if version not in network_classes:
+            raise ValueError(f'version must be 4 or 6, got {version}')
+        if version == 4:
+            bits, max_value, masks = 32, V4_MAX_VALUE, V4_CIDR_MASKS
+        else:
+            bits, max_value, masks = 128, V6_MAX_VALUE, V6_CIDR_MASKS
+        if (network < 0) or (network > max_value):
+            raise ValueError(f'Input value is outside of IPv{version} range: {network}')
+        if (prefix < 0) or (prefix > bits):
+            raise ValueError(f'{prefix} is not a valid CIDR bit count')
+        object.__setattr__(self, '_network', network & masks[bits - prefix])
+        object.__setattr__(self, '_prefix', prefix)
+        object.__setattr__(self, '_version', version)
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __eq__(self, other):
+        if not isinstance(other, SubnetInfo):
+            return NotImplemented
+        return (self._network, self._prefix, self._version) == (other._network, other._prefix, other._version)
+
+    def __getitem__(self, key: str) -> str:
+        if key not in self.keys:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __hash__(self):
+        return hash((self._network, self._prefix, self._version))
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.network_addr}/{self._prefix})'
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def to_dict(self) -> dict:
+        """Return the same dict subnet_info() does"""
+        return {key: getattr(self, key) for key in self.keys}
+
+    # int values
+
+    @property
+    def broadcast_int(self) -> int:
+        return self._network | (self.netmask_int ^ (V4_MAX_VALUE if self._version == 4 else V6_MAX_VALUE))
+
+    @property
+    def category_flags(self) -> ADDRCATEGORY:
+        return classify_network(self._network, self._prefix, self._version)
+
+    @property
+    def first_int(self) -> int:
+        return self._network if self._whole else self._network + 1
+
+    @property
+    def last_int(self) -> int:
+        return self.broadcast_int if self._whole else self.broadcast_int - 1
+
+    @property
+    def netmask_int(self) -> int:
+        if self._version == 4:
+            return V4_CIDR_MASKS[32 - self._prefix]
+        return V6_CIDR_MASKS[128 - self._prefix]
+
+    @property
+    def network_int(self) -> int:
+        return self._network
+
+    @property
+    def prefix_len(self) -> int:
+        return self._prefix
+
+    @property
+    def usable_count(self) -> int:
+        size = self.broadcast_int - self._network + 1
+        return size if self._whole else size - 2
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def _whole(self) -> bool:
+        """True for /31 and /32 (or /127 and /128), which have no network or broadcast address to exclude"""
+        return self._prefix >= (31 if self._version == 4 else 127)
+
+    # str values, matching the subnet_info() keys
+
+    @property
+    def broadcast_addr(self) -> str:
+        return self._format(self.broadcast_int)
+
+    @property
+    def category(self) -> str:
+        """Not one of the keys, as subnet_info() only includes it on request"""
+        return format_category(self.category_flags)
+
+    @property
+    def first_addr(self) -> str:
+        return self._format(self.first_int)
+
+    @property
+    def last_addr(self) -> str:
+        return self._format(self.last_int)
+
+    @property
+    def netmask(self) -> str:
+        return self._format(self.netmask_int)
+
+    @property
+    def network_addr(self) -> str:
+        return self._format(self._network)
+
+    @property
+    def prefix(self) -> str:
+        return str(self._prefix)
+
+    @property
+    def usable(self) -> str:
+        return str(self.usable_count)
+
+    def _format(self, value: int) -> str:
+        return _v4_str(value) if self._version == 4 else decToV6Str(value)
+
+
+class SubnetSplit(object):
+    """
+    Lazy, sliceable view of the child networks of a network split into a longer prefix, like ipaddress subnets().
+    Each child network is computed from its index when accessed, so even a split into 2**64 children costs nothing
+    until it is used. len() is limited to sys.maxsize by Python, use .count for bigger splits.
+    """
+    __slots__ = ('network', 'prefix', 'new_prefix', 'version', '_indexes', '_step')
+
+    def __init__(self, network: int, prefix: int, new_prefix: int, version: int = 4, _indexes: range = None):
+        bits = 32 if version == 4 else 128
+        if version not in network_classes:
+            raise ValueError(f'version must be 4 or 6, got {version}')
+        if (prefix < 0) or (prefix > bits):
+            raise ValueError(f'{prefix} is not a valid CIDR bit count')
+        if (new_prefix < prefix) or (new_prefix > bits):
+            raise ValueError(f'new_prefix {new_prefix} must be between prefix {prefix} and {bits}')
+        if (network < 0) or (network >= (1 << bits)) or (network & ((1 << (bits - prefix)) - 1)):
+            raise ValueError(f'{network} is not a valid /{prefix} IPv{version} network address')
+        self.network = network
+        self.prefix = prefix
+        self.new_prefix = new_prefix
+        self.version = version
+        self._indexes = range(1 << (new_prefix - prefix)) if _indexes is None else _indexes
+        self._step = 1 << (bits - new_prefix)
+
+    @property
+    def count(self) -> int:
+        """Number of child networks in this view, without the sys.maxsize limit of len()"""
+        indexes = self._indexes
+        if indexes.step > 0:
+            return max(0, (indexes.stop - indexes.start + indexes.step - 1) // indexes.step)
+        return max(0, (indexes.start - indexes.stop - indexes.step - 1) // -indexes.step)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return SubnetSplit(self.network, self.prefix, self.new_prefix, self.version, self._indexes[key])
+        return self._child(self._indexes[key])
+
+    def __iter__(self):
+        for index in self._indexes:
+            yield self._child(index)
+
+    def __len__(self):
+        return len(self._indexes)
+
+    def __repr__(self):
+        return (f'{type(self).__name__}({network_classes[self.version]((self.network, self.prefix))} '
+                f'into /{self.new_prefix}, {self._indexes})')
+
+    def __reversed__(self):
+        for index in reversed(self._indexes):
+            yield self._child(index)
+
+    def _child(self, index: int):
+        return network_classes[self.version]((self.network + (index * self._step), self.new_prefix))
 
-        return info_dict
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""This module contains a memory-mapped, read-only binary database of IPv4 subnets with str payloads"""
+
+import array
+import bisect
+import mmap
+import os
+import struct
+import sys
+import threading
+from .globals import V4_MAX_VALUE
+
+
+# File layout, all little-endian:
+#   header
+#   network column: uint32 network address of each record, sorted by (network, prefix)
+#   record column: fixed-width prefix, parent record index and payload location of each record
+#   string heap: UTF-8 payloads
+# Networks get a column to themselves so that bisect can run directly on a memoryview of it.
+_FILE_MAGIC = b'QSCSDB1\x00'
+_HEADER = struct.Struct('<8sII')  # magic, record count, reserved
+_RECORD = struct.Struct('<Bxxxiii')  # prefix, parent index (-1 for none), heap offset, payload length
+
+
+def write_subnet_db(path, records):
+    """
+    Write records to a file that SubnetDB can open.
+    :param path: path of the file to write
+    :param records: iterable of (network int, prefix int, payload str) tuples, in any order. Host bits are ignored.
+    :return: None
+    """
+    rows = []
+    for network, prefix, payload in records:
+        if (network < 0) or (network > V4_MAX_VALUE):
+            raise ValueError(f'Input value is outside of IPv4 range: {network}')
+        if (prefix < 0) or (prefix > 32):
+            raise ValueError(f'{prefix} is not a valid CIDR bit count')
+        rows.append((network & (V4_MAX_VALUE ^ ((1 << (32 - prefix)) - 1)), prefix, payload.encode('utf-8')))
+    # a prefix sorts before everything it contains, which lets parents be found with a stack
+    rows.sort(key=lambda row: (row[0], row[1]))
+
+    networks = array.array('I')
+    record_data = bytearray()
+    heap = bytearray()
+    open_parents = []  # indexes of the records containing the current one, outermost first
+    for index, (network, prefix, payload) in enumerate(rows):
+        if index and (rows[index - 1][:2] == (network, prefix)):
+            raise ValueError(f'duplicate subnet {network}/{prefix}')
+        while open_parents and not _contains(rows[open_parents[-1]][0], rows[open_parents[-1]][1], network):
+            open_parents.pop()
+        networks.append(network)
+        record_data += _RECORD.pack(prefix, open_parents[-1] if open_parents else -1, len(heap), len(payload))
+        heap += payload
+        open_parents.append(index)
+
+    if sys.byteorder != 'little':
+        networks.byteswap()
+    # written beside the target and renamed over it, so a SubnetDB that has it open never sees a partial file
+    temp_path = f'{os.fspath(path)}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        with open(temp_path, 'wb') as file_object:
+            file_object.write(_HEADER.pack(_FILE_MAGIC, len(rows), 0))
+            file_object.write(networks.tobytes())
+            file_object.write(record_data)
+            file_object.write(heap)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class SubnetDB(object):
+    """
+    Read-only view of a file written by write_subnet_db(). Opening it only maps the file, so startup time does not
+    depend on its size, and processes opening the same file share one copy in the page cache.
+    Lookups bisect the network column and then follow parent links, at most one per enclosing subnet.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as file_object:
+            self._mapped = mmap.mmap(file_object.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mapped)
+        magic, self._count, _ = _HEADER.unpack_from(view, 0)
+        if magic != _FILE_MAGIC:
+            raise ValueError(f'{path} is not a SubnetDB file')
+        records_offset = _HEADER.size + (self._count * 4)
+        heap_offset = records_offset + (self._count * _RECORD.size)
+        if sys.byteorder == 'little':
+            self._networks = view[_HEADER.size:records_offset].cast('I')
+        else:
+            self._networks = array.array('I', view[_HEADER.size:records_offset])
+            self._networks.byteswap()
+        self._records = view[records_offset:heap_offset]
+        self._heap = view[heap_offset:]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __iter__(self):
+        """Iterate over (network int, prefix int, payload str) tuples in file order"""
+        for index in range(self._count):
+            yield self._record(index)
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        # views into the map have to be released before it can be closed
+        for name in ('_networks', '_records', '_heap'):
+            view = getattr(self, name)
+            if isinstance(view, memoryview):
+                view.release()
+        self._mapped.close()
+
+    def get(self, network: int, prefix: int, default=None):
+        """Return the payload of an exact network/prefix, or default when it is not in the database"""
+        index = bisect.bisect_left(self._networks, network)
+        while (index < self._count) and (self._networks[index] == network):
+            record_prefix, _, heap_offset, length = _RECORD.unpack_from(self._records, index * _RECORD.size)
+            if record_prefix == prefix:
+                return str(self._heap[heap_offset:heap_offset + length], 'utf-8')
+            index += 1
+        return default
+
+    def lookup(self, address: int):
+        """Return (network int, prefix int, payload str) of the most specific subnet containing address, or None"""
+        index = bisect.bisect_right(self._networks, address) - 1
+        while index >= 0:
+            prefix, parent, _, _ = _RECORD.unpack_from(self._records, index * _RECORD.size)
+            if _contains(self._networks[index], prefix, address):
+                return self._record(index)
+            index = parent
+        return None
+
+    def _record(self, index: int) -> tuple:
+        prefix, _, heap_offset, length = _RECORD.unpack_from(self._records, index * _RECORD.size)
+        return self._networks[index], prefix, str(self._heap[heap_offset:heap_offset + length], 'utf-8')
+
+
+def _contains(network: int, prefix: int, address: int) -> bool:
+    return (address >> (32 - prefix)) == (network >> (32 - prefix))
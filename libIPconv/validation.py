@@ -19,6 +19,8 @@
 # If not, see <https://www.gnu.org/licenses/>.
 
 
+import string
+from .conversions import v6StrToDec
 from .convregex import *
 from .globals import *
 
@@ -30,22 +32,8 @@ def isValidIPv4(input_value, addr_type: int = ADDRTYPE.NONE, strict: bool = Fals
     The string can be a dotted-quad format, hex format, or decimal format. (no leading or trailing whitespace)
     strict mode will require dotted-quad format to include four valid octets
     """
-    check_value = -1
-
     if isinstance(input_value, str):
-        if '.' in input_value and (addr_type in [ADDRTYPE.NONE, ADDRTYPE.DOTTED]):
-            # Confirm match for dotted-quad format
-            if len(input_value) <= 15 and IP_RECLIST[ADDRTYPE.DOTTED].fullmatch(input_value):
-                if strict and not DOTTEDQUADIP_STRICTREC.fullmatch(input_value):
-                    check_value = -2
-                else:
-                    check_value = 0
-            else:
-                check_value = -3
-        elif IP_RECLIST[ADDRTYPE.DEC].fullmatch(input_value) and (addr_type in [ADDRTYPE.NONE, ADDRTYPE.DEC]):
-            check_value = int(input_value)
-        elif IP_RECLIST[ADDRTYPE.HEX].fullmatch(input_value) and (addr_type in [ADDRTYPE.NONE, ADDRTYPE.HEX]):
-            check_value = int(input_value, 16)
+        check_value = scanIPv4(input_value, addr_type, strict)
     elif isinstance(input_value, int):
         if addr_type in [ADDRTYPE.NONE, ADDRTYPE.DEC]:
             check_value = input_value
@@ -57,6 +45,39 @@ def isValidIPv4(input_value, addr_type: int = ADDRTYPE.NONE, strict: bool = Fals
     return (check_value >= 0) and (check_value <= V4_MAX_VALUE)
 
 
+def isValidIPv6(input_value, addr_type: int = ADDRTYPE.NONE) -> bool:
+    """
+    Accepts string or int value and returns True if it is a value in the range of valid IPv6 addresses.
+    The addr_type argument should be NONE, COLON, DEC or HEX from the ADDRTYPE enum. If input is int you must use
+    NONE or DEC addr_type. The string can be colon format (compressed or not), hex format, or decimal format.
+    """
+    check_value = -1
+
+    if isinstance(input_value, str):
+        if ':' in input_value:
+            if addr_type in [ADDRTYPE.NONE, ADDRTYPE.COLON]:
+                try:
+                    check_value = v6StrToDec(input_value)
+                except ValueError:
+                    pass
+        elif input_value.isascii():
+            if (addr_type in [ADDRTYPE.NONE, ADDRTYPE.DEC]) and (len(input_value) <= 39) and input_value.isdigit():
+                check_value = int(input_value)
+            elif addr_type in [ADDRTYPE.NONE, ADDRTYPE.HEX]:
+                digits = input_value[2:] if input_value[:2] in ('0x', '0X') else input_value
+                if (0 < len(digits) <= 32) and not digits.strip(string.hexdigits):
+                    check_value = int(digits, 16)
+    elif isinstance(input_value, int):
+        if addr_type in [ADDRTYPE.NONE, ADDRTYPE.DEC]:
+            check_value = input_value
+        else:
+            raise ValueError(f'Type int input_value passed with incompatible addr_type of {addr_type}')
+    else:
+        raise ValueError(f'Expected input type str or int. Got {type(input_value)}')
+
+    return (check_value >= 0) and (check_value <= V6_MAX_VALUE)
+
+
 def isValidIPv4Mask(input_value, mask_type: int = MASKTYPE.NONE) -> bool:
     """
     Accepts string or int value and returns True if it is a value in the range of valid IPv4 subnet masks.
@@ -84,7 +105,46 @@ def isValidIPv4Mask(input_value, mask_type: int = MASKTYPE.NONE) -> bool:
     else:
         raise ValueError(f'Expected input type str or int. Got {type(input_value)}')
 
-    return check_value in V4_CIDR_MASKS
+    return check_value in V4_CIDR_MASK_BITCOUNTS
+
+
+def scanIPv4(input_value: str, addr_type: int = ADDRTYPE.NONE, strict: bool = False) -> int:
+    """
+    Single-pass, regex-free parse of an IPv4 str accepting exactly what isValidIPv4() accepts.
+    Dotted-quad input with fewer than four octets is padded on the right, as augment.pad_dotted_right() would.
+    The result can be above V4_MAX_VALUE for decimal input of up to 10 digits, so check the range before using it.
+    :param input_value: str value in dotted-quad, hex, or decimal format (no leading or trailing whitespace)
+    :param addr_type: int value from the ADDRTYPE enum, NONE to accept any format
+    :param strict: bool for whether or not dotted-quad format must include four octets
+    :return: int value of the address or -1 if the input is not in an accepted format
+    """
+    if '.' in input_value:
+        if (addr_type != ADDRTYPE.NONE and addr_type != ADDRTYPE.DOTTED) or (len(input_value) > 15):
+            return -1
+        octets = input_value.split('.')
+        if (len(octets) > 4) or (strict and (len(octets) != 4)):
+            return -1
+        value = 0
+        for octet in octets:
+            # 1-3 ASCII digits and no more than 255
+            if not (0 < len(octet) < 4 and octet.isascii() and octet.isdigit()):
+                return -1
+            octet_value = int(octet)
+            if octet_value > 255:
+                return -1
+            value = (value << 8) | octet_value
+        return value << (8 * (4 - len(octets)))
+
+    if not input_value.isascii():
+        return -1
+    if (addr_type == ADDRTYPE.NONE or addr_type == ADDRTYPE.DEC) and (len(input_value) <= 10) and input_value.isdigit():
+        return int(input_value)
+    if addr_type == ADDRTYPE.NONE or addr_type == ADDRTYPE.HEX:
+        digits = input_value[2:] if input_value[:2] in ('0x', '0X') else input_value
+        # strip() removes all leading and trailing hex digits, so only an all-hex str ends up empty
+        if (0 < len(digits) <= 8) and not digits.strip(string.hexdigits):
+            return int(digits, 16)
+    return -1
 
 
 # TODO: decide if this will all go away or just use ipaddress module for backend (especially for IPv6)
@@ -95,7 +155,7 @@ def validate_addr(addr: int, version: int):
 
 
 def validate_mask(addr: int, version: int):
-    return addr in (V6_CIDR_MASKS if version == 6 else V4_CIDR_MASKS)
+    return addr in (V6_CIDR_MASK_BITCOUNTS if version == 6 else V4_CIDR_MASK_BITCOUNTS)
 
 
 def validate_version(version: int):
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick Subnet Calculator
+#
+# Quick Subnet Calculator is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick Subnet Calculator is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick Subnet Calculator.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""This module contains a background worker that only runs the latest of the requests submitted to it"""
+
+import threading
+import traceback
+
+
+class LatestRequestWorker(object):
+    """
+    Runs function(*args) on a daemon thread for the most recent submit() call, dropping requests that were replaced
+    before the thread got to them. callback(request_id, result) is called on the worker thread, so GUI code should
+    hand the result over to its own thread (e.g. with wx.CallAfter) and can use is_latest() to skip stale results.
+    """
+
+    def __init__(self, function, callback, delay: float = 0.0, name: str = 'LatestRequestWorker'):
+        """
+        :param function: callable doing the work, it is only ever called from the worker thread
+        :param callback: callable taking (request_id, result) for each request that was run
+        :param delay: float seconds without a newer request before one is run (debounce), 0 to run right away
+        """
+        if delay < 0:
+            raise ValueError(f'delay must not be negative, got {delay}')
+        self.callback = callback
+        self.delay = delay
+        self.function = function
+        self._condition = threading.Condition()
+        self._pending = None  # (request_id, args) of the newest request not yet picked up
+        self._request_id = 0
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def is_latest(self, request_id: int) -> bool:
+        """True if no request was submitted after the one with this id"""
+        return request_id == self._request_id
+
+    def stop(self, timeout: float = None):
+        """Drop any pending request and end the worker thread, waiting up to timeout seconds for it"""
+        with self._condition:
+            self._pending = None
+            self._stopped = True
+            self._condition.notify()
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+
+    def submit(self, *args) -> int:
+        """Replace any pending request with function(*args) and return the id the callback will receive"""
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError(f'{type(self).__name__} has been stopped')
+            self._request_id += 1
+            self._pending = (self._request_id, args)
+            self._condition.notify()
+            return self._request_id
+
+    def _next_request(self):
+        """Wait for a request that has not been replaced for self.delay seconds, None once stopped"""
+        with self._condition:
+            while True:
+                while (self._pending is None) and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return None
+                request = self._pending
+                if self.delay and self._condition.wait_for(
+                        lambda: (self._pending is not request) or self._stopped, timeout=self.delay):
+                    continue  # replaced (or stopped) during the quiet period
+                self._pending = None
+                return request
+
+    def _run(self):
+        while True:
+            request = self._next_request()
+            if request is None:
+                return
+            request_id, args = request
+            try:
+                self.callback(request_id, self.function(*args))
+            except Exception:
+                traceback.print_exc()  # keep the worker alive for the next request